@@ -1,8 +1,17 @@
 import asyncio
-import json
+import orjson
 import websockets
 from typing import Optional
 
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Translate table that deletes NUL characters in a single pass
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
 class RCON:
     """Minimal RCON WebSocket client"""
     
@@ -52,17 +61,17 @@ class RCON:
                 "Stacktrace": None
             }
             
-            # Send command
-            await self.websocket.send(json.dumps(data))
+            # Send command (text frame, Rust's WebRCON ignores binary frames)
+            await self.websocket.send(orjson.dumps(data).decode())
             print(f"Sent: {command}")
             
-            # Wait for response
+            # Wait for response (orjson parses str or bytes frames directly)
             response = await self.websocket.recv()
-            response_data = json.loads(response)
+            response_data = orjson.loads(response)
             
             # Get response text
             message = response_data.get("Message", "")
-            message = message.replace("\u0000", "").strip()
+            message = message.translate(_NULL_TABLE).strip()
             
             self.command_counter += 1
             return message
@@ -131,4 +140,6 @@ async def main():
         print("\nDisconnected")
 if __name__ == "__main__":
     # Run the async main function
+    if uvloop:
+        uvloop.install()
     asyncio.run(main())
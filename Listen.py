@@ -1,31 +1,54 @@
 import asyncio
-import json
+import sys
+import orjson
 import websockets
+from websockets.asyncio.client import connect, ClientConnection
 from typing import Optional
-from datetime import datetime
+from timestamps import format_timestamp
+
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Translate table that deletes NUL characters in a single pass
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
+# Initial command, constant so it is encoded once (sent as text, Rust's WebRCON ignores binary frames)
+_INIT_FRAME = orjson.dumps({
+    "Message": "",
+    "Identifier": 1,
+    "Type": "Command",
+    "Stacktrace": None
+}).decode()
+
+# Re-indent the full JSON of each frame (python Listen.py --pretty), otherwise show it as received
+PRETTY_JSON = '--pretty' in sys.argv
 
 class RCONListener:
     """RCON WebSocket client that listens to ALL server messages"""
     
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.websocket: Optional[ClientConnection] = None
     
     async def connect(self) -> bool:
         """Establish connection to server"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # RCON frames are small and local, compression only costs CPU on every recv
+            self.websocket = await connect(
+                self.uri,
+                compression=None,
+                max_size=2**20,
+                max_queue=256,
+                open_timeout=5
+            )
             print("Connected successfully")
             
             # Send initial command to start receiving messages
-            init_data = {
-                "Message": "",
-                "Identifier": 1,
-                "Type": "Command",
-                "Stacktrace": None
-            }
-            await self.websocket.send(json.dumps(init_data))
+            await self.websocket.send(_INIT_FRAME)
             
             return True
         except Exception as e:
@@ -47,11 +70,12 @@ class RCONListener:
         try:
             while True:
                 # Wait for message from server
-                raw_response = await self.websocket.recv()
+                # Raw bytes: orjson parses them directly, no str built per frame
+                raw_response = await self.websocket.recv(decode=False)
                 
                 # Try to parse as JSON first
                 try:
-                    response_data = json.loads(raw_response)
+                    response_data = orjson.loads(raw_response)
                     
                     # Extract all available information
                     message = response_data.get("Message", "")
@@ -60,55 +84,66 @@ class RCONListener:
                     stacktrace = response_data.get("Stacktrace", "")
                     
                     message_count += 1
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                    timestamp = format_timestamp()
                     
-                    print(f"\n{'='*60}")
-                    print(f"Message #{message_count} | {timestamp}")
-                    print(f"Type: {message_type} | ID: {identifier}")
-                    print(f"{'='*60}")
+                    # Build the whole report first so each message is one stdout write
+                    lines = [
+                        f"\n{'='*60}",
+                        f"Message #{message_count} | {timestamp}",
+                        f"Type: {message_type} | ID: {identifier}",
+                        f"{'='*60}"
+                    ]
                     
                     # Print message content if it exists
                     if message:
-                        print("Message content:")
+                        lines.append("Message content:")
                         if isinstance(message, str):
                             # Show raw string with escape sequences
-                            print(f"Raw: {repr(message)}")
+                            lines.append(f"Raw: {repr(message)}")
                             # Show cleaned version
-                            clean_message = message.replace("\u0000", "").strip()
+                            clean_message = message.translate(_NULL_TABLE).strip()
                             if clean_message:
-                                print(f"Clean: {clean_message}")
+                                lines.append(f"Clean: {clean_message}")
                         else:
-                            print(f"Type: {type(message).__name__} | Value: {message}")
+                            lines.append(f"Type: {type(message).__name__} | Value: {message}")
                     
                     # Print stacktrace if it exists
                     if stacktrace:
-                        print(f"Stacktrace: {stacktrace}")
+                        lines.append(f"Stacktrace: {stacktrace}")
                     
-                    # Print full JSON for debugging
-                    print(f"\nFull JSON:")
-                    print(json.dumps(response_data, indent=2))
+                    # Print full JSON for debugging (the raw payload already is the JSON)
+                    lines.append(f"\nFull JSON:")
+                    if PRETTY_JSON:
+                        lines.append(orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode())
+                    else:
+                        lines.append(raw_response.decode('utf-8', 'replace'))
+                    print("\n".join(lines))
                     
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # If not JSON, show raw data
                     message_count += 1
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                    timestamp = format_timestamp()
                     
-                    print(f"\n{'='*60}")
-                    print(f"Message #{message_count} | {timestamp}")
-                    print(f"{'='*60}")
-                    print("Non-JSON data received:")
-                    print(f"Raw bytes: {repr(raw_response)}")
-                    print(f"Length: {len(raw_response)} bytes")
+                    print(
+                        f"\n{'='*60}\n"
+                        f"Message #{message_count} | {timestamp}\n"
+                        f"{'='*60}\n"
+                        "Non-JSON data received:\n"
+                        f"Raw bytes: {repr(raw_response)}\n"
+                        f"Length: {len(raw_response)} bytes"
+                    )
                     
                 except Exception as parse_error:
                     message_count += 1
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                    timestamp = format_timestamp()
                     
-                    print(f"\n{'='*60}")
-                    print(f"Message #{message_count} | {timestamp}")
-                    print(f"{'='*60}")
-                    print(f"Parse error: {parse_error}")
-                    print(f"Raw data: {repr(raw_response)}")
+                    print(
+                        f"\n{'='*60}\n"
+                        f"Message #{message_count} | {timestamp}\n"
+                        f"{'='*60}\n"
+                        f"Parse error: {parse_error}\n"
+                        f"Raw data: {repr(raw_response)}"
+                    )
                     
         except websockets.exceptions.ConnectionClosed as e:
             print(f"\nConnection closed: {e}")
@@ -157,4 +192,6 @@ async def main():
 
 if __name__ == "__main__":
     # Run the async main function
+    if uvloop:
+        uvloop.install()
     asyncio.run(main())
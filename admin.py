@@ -2,12 +2,26 @@ import discord
 import asyncio
 import os
 import re
-import json
+import shlex
+import socket
+import time
+import logging
+import orjson
 import websockets
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Union
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Setup logging (set to DEBUG to dump every RCON message)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -18,33 +32,87 @@ RCON_PORT = int(os.getenv('RCON_PORT'))
 RCON_PASSWORD = os.getenv('RCON_PASSWORD')
 ADMIN_CHANNEL_ID = int(os.getenv('ADMIN_CHAT'))
 
+# Precompiled patterns
+_COORD_RE = re.compile(r'\(([-\d.]+),\s*([-\d.]+),\s*([-\d.]+)\)')
+
+# Translate table that deletes NUL characters in a single pass
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
+# Seconds to wait for a command response before forgetting about it
+PENDING_RESPONSE_TTL = 60.0
+
+# Initial command that starts the message stream, serialized once
+_INIT_FRAME = orjson.dumps({
+    "Message": "",
+    "Identifier": 1,
+    "Type": "Command",
+    "Stacktrace": None
+}).decode()
+
+# Reused command payload, Message/Identifier are filled in per send
+_COMMAND_DATA = {
+    "Message": "",
+    "Identifier": 0,
+    "Type": "Command",
+    "Stacktrace": None
+}
+
+@dataclass(slots=True)
+class RCONMessage:
+    """A parsed RCON frame"""
+    message: str
+    type: str
+    identifier: int
+
 class RCONListener:
     """RCON WebSocket client that listens to ALL server messages"""
     
+    __slots__ = ('uri', 'websocket', 'command_counter', 'is_connected',
+                 'pending_responses', 'listening', '_outq', '_writer_task',
+                 '_conn_lock')
+    
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.command_counter = 1
         self.is_connected = False
-        self.pending_responses = {}
+        self.pending_responses = {}  # id -> (type, channel, message, monotonic deadline)
         self.listening = False
+        self._outq: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._conn_lock = asyncio.Lock()
     
     async def connect(self) -> bool:
-        """Establish connection to server"""
+        """Establish connection to server (no-op if already connected)"""
+        async with self._conn_lock:
+            # Someone else may have connected while we waited for the lock
+            if self.is_connected and self.websocket:
+                return True
+            return await self._connect()
+    
+    async def _connect(self) -> bool:
+        """Open the websocket, caller must hold _conn_lock"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # No permessage-deflate: RCON frames are small and usually on LAN
+            self.websocket = await websockets.connect(
+                self.uri,
+                ping_interval=20,
+                ping_timeout=20,
+                compression=None,
+                max_size=2**20,
+                max_queue=64
+            )
+            self._set_nodelay()
             self.is_connected = True
             print("Connected successfully")
             
             # Send initial command to start receiving messages
-            init_data = {
-                "Message": "",
-                "Identifier": 1,
-                "Type": "Command",
-                "Stacktrace": None
-            }
-            await self.websocket.send(json.dumps(init_data))
+            await self.websocket.send(_INIT_FRAME)
+            
+            # Start the outbound writer (kept across reconnects)
+            if self._writer_task is None or self._writer_task.done():
+                self._writer_task = asyncio.create_task(self._writer())
             
             return True
         except Exception as e:
@@ -52,6 +120,15 @@ class RCONListener:
             self.is_connected = False
             return False
     
+    def _set_nodelay(self) -> None:
+        """Disable Nagle so small commands are not held back by the kernel"""
+        try:
+            sock = self.websocket.transport.get_extra_info('socket')
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            print(f"Could not set TCP_NODELAY: {e}")
+    
     async def listen_forever(self):
         """Continuously listen for ALL server messages (run this once!)"""
         if not self.websocket:
@@ -65,103 +142,88 @@ class RCONListener:
         self.listening = True
         print("\nListening for ALL server messages...")
         
+        # Bind hot-path lookups once for the loop below
+        websocket = self.websocket
+        process = self._process_raw_message
+        
         try:
-            while self.listening:
-                try:
-                    # Wait for message from server with timeout
-                    raw_response = await asyncio.wait_for(self.websocket.recv(), timeout=30.0)
-                    
-                    # Process the raw message
-                    message_data = await self._process_raw_message(raw_response)
-                    if message_data:
-                        # Yield the message for processing
-                        yield message_data
-                        
-                except asyncio.TimeoutError:
-                    # Send ping to keep connection alive
-                    try:
-                        await self.websocket.ping()
-                        continue
-                    except:
-                        print("Connection timeout, attempting to reconnect...")
-                        self.is_connected = False
-                        break
-                        
-                except websockets.exceptions.ConnectionClosed as e:
-                    print(f"Connection closed: {e}")
-                    self.is_connected = False
+            # Keepalive pings are handled by websockets itself (ping_interval)
+            async for raw_response in websocket:
+                if not self.listening:
                     break
+                
+                # Process the raw message
+                rcon_message = await process(raw_response)
+                if rcon_message:
+                    # Yield the message for processing
+                    yield rcon_message
+            
+            # Iteration ends when the server closes the connection
+            print("Connection closed")
+            self.is_connected = False
                     
+        except websockets.exceptions.ConnectionClosed as e:
+            print(f"Connection closed: {e}")
+            self.is_connected = False
         except Exception as e:
             print(f"Error listening: {e}")
             self.is_connected = False
         finally:
             self.listening = False
     
-    async def _process_raw_message(self, raw_response: str):
-        """Process raw WebSocket message and extract data"""
+    async def _process_raw_message(self, raw_response: Union[str, bytes]) -> Optional[RCONMessage]:
+        """Parse raw WebSocket message (text or binary frame), None if not JSON"""
         try:
-            response_data = json.loads(raw_response)
-            
-            # Extract all available information
-            message = response_data.get("Message", "")
-            message_type = response_data.get("Type", "")
-            identifier = response_data.get("Identifier", "")
-            stacktrace = response_data.get("Stacktrace", "")
-            
-            # Clean up the message
-            if isinstance(message, str):
-                message = message.replace("\u0000", "").strip()
-            
-            return {
-                "raw_response": raw_response,
-                "message": message,
-                "message_type": message_type,
-                "identifier": identifier,
-                "stacktrace": stacktrace,
-                "raw_data": response_data,
-                "is_json": True
-            }
-            
-        except json.JSONDecodeError:
-            # If not JSON, return raw data
-            return {
-                "raw_response": raw_response,
-                "message": None,
-                "message_type": None,
-                "identifier": None,
-                "stacktrace": None,
-                "raw_data": None,
-                "is_json": False
-            }
+            response_data = orjson.loads(raw_response)
+            message = response_data["Message"]
+            message_type = response_data["Type"]
+            identifier = response_data["Identifier"]
+        except orjson.JSONDecodeError:
+            print(f"Non-JSON data received: {repr(raw_response)}")
+            return None
+        except (KeyError, TypeError):
+            # Valid JSON but not an RCON frame (missing keys or not an object)
+            print(f"Unexpected frame received: {repr(raw_response)}")
+            return None
+        
+        # Clean up the message
+        if isinstance(message, str):
+            message = message.translate(_NULL_TABLE).strip()
+        
+        return RCONMessage(message, message_type, identifier)
     
     async def send_command(self, command: str, command_type: str = "", discord_channel = None, discord_message: str = "") -> bool:
-        """Send command to WebSocket RCON server"""
+        """Queue a command for the writer and wait until it was written to the RCON server"""
         try:
             if not self.is_connected or not self.websocket:
                 if not await self.connect():
                     return False
             
+            # Claim the ID before awaiting so concurrent commands never share one
             current_id = self.command_counter
+            self.command_counter += 1
             
             # Store pending response info if we need to handle the response
             if discord_channel:
-                self.pending_responses[current_id] = {
-                    "type": command_type,
-                    "channel": discord_channel,
-                    "message": discord_message
-                }
+                now = time.monotonic()
+                self._reap_pending(now)
+                self.pending_responses[current_id] = (
+                    command_type, discord_channel, discord_message, now + PENDING_RESPONSE_TTL
+                )
             
-            command_data = {
-                "Message": command,
-                "Identifier": current_id,
-                "Type": "Command",
-                "Stacktrace": None
-            }
+            command_data = _COMMAND_DATA
+            command_data["Message"] = command
+            command_data["Identifier"] = current_id
+            
+            # Rust's WebRCON only dispatches text frames, so queue str not bytes
+            written = asyncio.get_running_loop().create_future()
+            self._outq.put_nowait((orjson.dumps(command_data).decode(), written))
+            
+            if not await written:
+                self.pending_responses.pop(current_id, None)
+                return False
             
-            await self.websocket.send(json.dumps(command_data))
             print(f"Sent command (ID {current_id}): {command}")
-            self.command_counter += 1
             return True
             
         except Exception as e:
@@ -169,33 +231,98 @@ class RCONListener:
             self.is_connected = False
             return False
     
+    def _reap_pending(self, now: float) -> None:
+        """Drop pending responses the server never answered"""
+        # Insertion order is deadline order, so stop at the first live entry
+        pending = self.pending_responses
+        while pending:
+            oldest = next(iter(pending))
+            if pending[oldest][3] >= now:
+                break
+            del pending[oldest]
+    
+    async def _writer(self):
+        """Drain queued (frame, future) pairs, write the frames back-to-back and resolve
+        each future with whether its frame was written"""
+        while True:
+            batch = [await self._outq.get()]
+            
+            # Grab whatever else is already waiting, without yielding
+            while len(batch) < 32:
+                try:
+                    batch.append(self._outq.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            # One JSON command per frame is all WebRCON understands
+            sent = 0
+            try:
+                for payload, _ in batch:
+                    await self.websocket.send(payload)
+                    sent += 1
+            except Exception as e:
+                print(f"Error sending to RCON: {e}")
+                self.is_connected = False
+            finally:
+                # Tell each caller whether its frame went out (also when cancelled by close)
+                for index, (_, written) in enumerate(batch):
+                    if not written.done():
+                        written.set_result(index < sent)
+    
     async def reconnect(self):
         """Reconnect to the server"""
-        await self.close()
-        return await self.connect()
+        async with self._conn_lock:
+            # Skip if another task already reconnected
+            if self.is_connected and self.websocket:
+                return True
+            await self.close()
+            return await self._connect()
     
     async def close(self) -> None:
         """Close the connection"""
         self.listening = False
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        # Commands still queued will never be written
+        while not self._outq.empty():
+            _, written = self._outq.get_nowait()
+            if not written.done():
+                written.set_result(False)
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
             self.is_connected = False
 
+def _valid_coordinate(part: str) -> bool:
+    """Check one coordinate is an optional '-' then digits with at most one '.' between them"""
+    if part.startswith('-'):
+        part = part[1:]
+    whole, dot, fraction = part.partition('.')
+    if not (whole.isascii() and whole.isdigit()):
+        return False
+    return not dot or (fraction.isascii() and fraction.isdigit())
+
+def valid_coordinates(coordinates_str: str) -> bool:
+    """Check that a string is three plain decimal numbers in x,y,z form.
+    The string goes to the server unchanged, so anything float() would
+    also accept ("1e3", "nan", " 1") is rejected"""
+    parts = coordinates_str.split(',')
+    return len(parts) == 3 and all(_valid_coordinate(part) for part in parts)
+
 def format_command_response(command_type: str, server_response: str, original_message: str = "") -> Optional[str]:
     """Format server response for Discord based on command type"""
     
     server_response = server_response.strip()
     
     if command_type == "printpos":
-        coord_pattern = r'\(([-\d\.]+),\s*([-\d\.]+),\s*([-\d\.]+)\)'
-        coord_match = re.search(coord_pattern, server_response)
+        coord_match = _COORD_RE.search(server_response)
         
         if coord_match:
             x, y, z = coord_match.groups()
             coordinates = f"{x},{y},{z}"
-            player_match = re.search(r'printpos\s*"([^"]+)"', original_message)
-            player_name = player_match.group(1) if player_match else "player"
+            # For printpos the original message is the player name
+            player_name = original_message or "player"
             return f"📍 **{player_name}** is at coordinates: `{coordinates}`"
     
     elif command_type == "players":
@@ -246,188 +373,23 @@ async def listen_to_rcon():
                     continue
             
             # Use the listen_forever generator
-            async for message_data in rcon_listener.listen_forever():
-                await process_rcon_message(message_data)
+            async for rcon_message in rcon_listener.listen_forever():
+                await process_rcon_message(rcon_message)
                 
         except Exception as e:
             print(f"Error in RCON listener: {e}")
             await asyncio.sleep(5)
 
-@bot.event
-async def on_message(message):
-    # Ignore messages from the bot itself
-    if message.author == bot.user:
-        return
-    
-    # Only respond in admin channel
-    if message.channel.id != ADMIN_CHANNEL_ID:
-        return
-    
-    # Handle commands
-    if message.content.startswith('!'):
-        content = message.content[1:].strip()
-        
-        if content == 'players':
-            success = await rcon_listener.send_command('players', "players", message.channel)
-            if success:
-                await message.channel.send("📊 Requesting player list from server...")
-            else:
-                await message.channel.send("❌ Failed to send command. Check bot logs.")
-            
-        elif content == 'time':
-            success = await rcon_listener.send_command('time', "time", message.channel)
-            if success:
-                await message.channel.send("🕐 Requesting server time...")
-            else:
-                await message.channel.send("❌ Failed to send command. Check bot logs.")
-            
-        elif content.startswith('say'):
-            say_content = content[3:].strip()
-            
-            if '"' in say_content:
-                import shlex
-                try:
-                    parts = shlex.split(say_content)
-                    
-                    if len(parts) >= 1:
-                        message_text = ' '.join(parts)
-                        rcon_command = f'say "{message_text}"'
-                        success = await rcon_listener.send_command(rcon_command, "say", message.channel, message_text)
-                        
-                        if success:
-                            await message.channel.send(f"📢 Broadcasting message: `{message_text}`")
-                            print(f"Admin used say: {message_text}")
-                        else:
-                            await message.channel.send("❌ Failed to send command.")
-                        
-                    else:
-                        await message.channel.send("❌ Usage: `!say \"message\"`")
-                        
-                except Exception as e:
-                    await message.channel.send(f"❌ Error parsing command: {e}")
-            else:
-                message_text = say_content
-                if message_text:
-                    rcon_command = f'say "{message_text}"'
-                    success = await rcon_listener.send_command(rcon_command, "say", message.channel, message_text)
-                    if success:
-                        await message.channel.send(f"📢 Broadcasting message: `{message_text}`")
-                        print(f"Admin used say: {message_text}")
-                    else:
-                        await message.channel.send("❌ Failed to send command.")
-                else:
-                    await message.channel.send("❌ Usage: `!say \"message\"`")
-            
-        elif content.startswith('givedrop'):
-            parts = content.split()
-            if len(parts) >= 5:
-                player_name = parts[1]
-                item_name = parts[2]
-                
-                try:
-                    amount = int(parts[3])
-                    stacks = int(parts[4])
-                    
-                    rcon_command = f'givedrop {player_name} {item_name} {amount} {stacks}'
-                    success = await rcon_listener.send_command(rcon_command, "givedrop", message.channel)
-                    
-                    if success:
-                        await message.channel.send(f"🎁 Giving {amount} {item_name} (in {stacks} stacks) to `{player_name}`")
-                        print(f"Admin used givedrop: {player_name} {item_name} {amount} {stacks}")
-                    else:
-                        await message.channel.send("❌ Failed to send command.")
-                    
-                except ValueError:
-                    await message.channel.send("❌ Error: Amount and stacks must be numbers!")
-            else:
-                await message.channel.send("❌ Usage: `!givedrop <player_name> <item_name> <amount> <stacks>`")
-        
-        elif content.startswith('giveto'):
-            parts = content.split()
-            if len(parts) >= 4:
-                player_name = parts[1]
-                item_name = parts[2]
-                
-                try:
-                    amount = int(parts[3])
-                    
-                    rcon_command = f'giveto {player_name} {item_name} {amount}'
-                    success = await rcon_listener.send_command(rcon_command, "giveto", message.channel)
-                    
-                    if success:
-                        await message.channel.send(f"🎁 Giving {amount} {item_name} to `{player_name}`")
-                        print(f"Admin used giveto: {player_name} {item_name} {amount}")
-                    else:
-                        await message.channel.send("❌ Failed to send command.")
-                    
-                except ValueError:
-                    await message.channel.send("❌ Error: Amount must be a number!")
-            else:
-                await message.channel.send("❌ Usage: `!giveto <player_name> <item_name> <amount>`")
-        
-        elif content.startswith('spawn'):
-            parts = content.split()
-            
-            if len(parts) >= 3:
-                item_name = parts[1]
-                coordinates_str = parts[2]
-                
-                coord_pattern = r'^-?\d+(\.\d+)?,-?\d+(\.\d+)?,-?\d+(\.\d+)?$'
-                if not re.match(coord_pattern, coordinates_str):
-                    await message.channel.send("❌ Error: Invalid coordinates format!\nUsage: `!spawn <item_name> <x,y,z>`")
-                    return
-                
-                rcon_command = f'spawn {item_name} {coordinates_str}'
-                success = await rcon_listener.send_command(rcon_command, "spawn", message.channel)
-                
-                if success:
-                    await message.channel.send(f"🎁 Spawning `{item_name}` at `{coordinates_str}`")
-                    print(f"Admin used spawn: {item_name} at {coordinates_str}")
-                else:
-                    await message.channel.send("❌ Failed to send command.")
-                
-            else:
-                await message.channel.send("❌ Usage: `!spawn <item_name> <x,y,z>`")
-            
-        elif content.startswith('printpos'):
-            printpos_content = content[8:].strip()
-            
-            if '"' in printpos_content:
-                import shlex
-                try:
-                    parts = shlex.split(printpos_content)
-                    
-                    if len(parts) == 1:
-                        player_name = parts[0]
-                        rcon_command = f'printpos "{player_name}"'
-                        success = await rcon_listener.send_command(rcon_command, "printpos", message.channel, rcon_command)
-                        
-                        if success:
-                            await message.channel.send(f"📍 Getting position for: `{player_name}`")
-                            print(f"Admin used printpos: {player_name}")
-                        else:
-                            await message.channel.send("❌ Failed to send command.")
-                        
-                    else:
-                        await message.channel.send("❌ Usage: `!printpos \"player_name\"`")
-                        
-                except Exception as e:
-                    await message.channel.send(f"❌ Error parsing command: {e}")
-            else:
-                player_name = printpos_content
-                if player_name:
-                    rcon_command = f'printpos "{player_name}"'
-                    success = await rcon_listener.send_command(rcon_command, "printpos", message.channel, rcon_command)
-                    if success:
-                        await message.channel.send(f"📍 Getting position for: `{player_name}`")
-                        print(f"Admin used printpos: {player_name}")
-                    else:
-                        await message.channel.send("❌ Failed to send command.")
-                else:
-                    await message.channel.send("❌ Usage: `!printpos \"player_name\"`")
-        
-        elif content == 'help':
-            help_text = """
+# Static Discord responses
+_FAILED_CHECK_LOGS = "❌ Failed to send command. Check bot logs."
+_FAILED = "❌ Failed to send command."
+_SAY_USAGE = "❌ Usage: `!say \"message\"`"
+_GIVEDROP_USAGE = "❌ Usage: `!givedrop <player_name> <item_name> <amount> <stacks>`"
+_GIVETO_USAGE = "❌ Usage: `!giveto <player_name> <item_name> <amount>`"
+_SPAWN_USAGE = "❌ Usage: `!spawn <item_name> <x,y,z>`"
+_SPAWN_BAD_COORDS = "❌ Error: Invalid coordinates format!\nUsage: `!spawn <item_name> <x,y,z>`"
+_PRINTPOS_USAGE = "❌ Usage: `!printpos \"player_name\"`"
+_HELP_TEXT = """
 **📊 Server Commands:**
 • `!players` - List online players
 • `!time` - Check server time
@@ -449,50 +411,240 @@ async def on_message(message):
   Example: `!spawn wood -100,50,200`
   Example: `!spawn stone 0,100,300`
 """
-            await message.channel.send(help_text)
 
-async def process_rcon_message(message_data):
-    """Process a single RCON message"""
-    global rcon_listener
+async def handle_players(message, args: str):
+    """!players - list online players"""
+    success = await rcon_listener.send_command('players', "players", message.channel)
+    if success:
+        await message.channel.send("📊 Requesting player list from server...")
+    else:
+        await message.channel.send(_FAILED_CHECK_LOGS)
+
+async def handle_time(message, args: str):
+    """!time - check server time"""
+    success = await rcon_listener.send_command('time', "time", message.channel)
+    if success:
+        await message.channel.send("🕐 Requesting server time...")
+    else:
+        await message.channel.send(_FAILED_CHECK_LOGS)
+
+async def handle_say(message, args: str):
+    """!say "message" - broadcast message to all players"""
+    say_content = args
+    
+    if '"' in say_content:
+        try:
+            parts = shlex.split(say_content)
+            
+            if len(parts) >= 1:
+                message_text = ' '.join(parts)
+                rcon_command = f'say "{message_text}"'
+                success = await rcon_listener.send_command(rcon_command, "say", message.channel, message_text)
+                
+                if success:
+                    await message.channel.send(f"📢 Broadcasting message: `{message_text}`")
+                    print(f"Admin used say: {message_text}")
+                else:
+                    await message.channel.send(_FAILED)
+                
+            else:
+                await message.channel.send(_SAY_USAGE)
+                
+        except Exception as e:
+            await message.channel.send(f"❌ Error parsing command: {e}")
+    else:
+        message_text = say_content
+        if message_text:
+            rcon_command = f'say "{message_text}"'
+            success = await rcon_listener.send_command(rcon_command, "say", message.channel, message_text)
+            if success:
+                await message.channel.send(f"📢 Broadcasting message: `{message_text}`")
+                print(f"Admin used say: {message_text}")
+            else:
+                await message.channel.send(_FAILED)
+        else:
+            await message.channel.send(_SAY_USAGE)
+
+async def handle_givedrop(message, args: str):
+    """!givedrop player_name item_name amount stacks"""
+    parts = args.split()
+    if len(parts) >= 4:
+        player_name = parts[0]
+        item_name = parts[1]
+        
+        try:
+            amount = int(parts[2])
+            stacks = int(parts[3])
+            
+            rcon_command = f'givedrop {player_name} {item_name} {amount} {stacks}'
+            success = await rcon_listener.send_command(rcon_command, "givedrop", message.channel)
+            
+            if success:
+                await message.channel.send(f"🎁 Giving {amount} {item_name} (in {stacks} stacks) to `{player_name}`")
+                print(f"Admin used givedrop: {player_name} {item_name} {amount} {stacks}")
+            else:
+                await message.channel.send(_FAILED)
+            
+        except ValueError:
+            await message.channel.send("❌ Error: Amount and stacks must be numbers!")
+    else:
+        await message.channel.send(_GIVEDROP_USAGE)
+
+async def handle_giveto(message, args: str):
+    """!giveto player_name item_name amount"""
+    parts = args.split()
+    if len(parts) >= 3:
+        player_name = parts[0]
+        item_name = parts[1]
+        
+        try:
+            amount = int(parts[2])
+            
+            rcon_command = f'giveto {player_name} {item_name} {amount}'
+            success = await rcon_listener.send_command(rcon_command, "giveto", message.channel)
+            
+            if success:
+                await message.channel.send(f"🎁 Giving {amount} {item_name} to `{player_name}`")
+                print(f"Admin used giveto: {player_name} {item_name} {amount}")
+            else:
+                await message.channel.send(_FAILED)
+            
+        except ValueError:
+            await message.channel.send("❌ Error: Amount must be a number!")
+    else:
+        await message.channel.send(_GIVETO_USAGE)
+
+async def handle_spawn(message, args: str):
+    """!spawn item_name x,y,z"""
+    parts = args.split()
     
-    if not message_data.get("is_json"):
-        # Non-JSON message
-        raw_response = message_data.get("raw_response", "")
-        print(f"Non-JSON data received: {repr(raw_response)}")
+    if len(parts) >= 2:
+        item_name = parts[0]
+        coordinates_str = parts[1]
+        
+        if not valid_coordinates(coordinates_str):
+            await message.channel.send(_SPAWN_BAD_COORDS)
+            return
+        
+        rcon_command = f'spawn {item_name} {coordinates_str}'
+        success = await rcon_listener.send_command(rcon_command, "spawn", message.channel)
+        
+        if success:
+            await message.channel.send(f"🎁 Spawning `{item_name}` at `{coordinates_str}`")
+            print(f"Admin used spawn: {item_name} at {coordinates_str}")
+        else:
+            await message.channel.send(_FAILED)
+        
+    else:
+        await message.channel.send(_SPAWN_USAGE)
+
+async def handle_printpos(message, args: str):
+    """!printpos "player_name" - get player position"""
+    printpos_content = args
+    
+    if '"' in printpos_content:
+        try:
+            parts = shlex.split(printpos_content)
+            
+            if len(parts) == 1:
+                player_name = parts[0]
+                rcon_command = f'printpos "{player_name}"'
+                success = await rcon_listener.send_command(rcon_command, "printpos", message.channel, player_name)
+                
+                if success:
+                    await message.channel.send(f"📍 Getting position for: `{player_name}`")
+                    print(f"Admin used printpos: {player_name}")
+                else:
+                    await message.channel.send(_FAILED)
+                
+            else:
+                await message.channel.send(_PRINTPOS_USAGE)
+                
+        except Exception as e:
+            await message.channel.send(f"❌ Error parsing command: {e}")
+    else:
+        player_name = printpos_content
+        if player_name:
+            rcon_command = f'printpos "{player_name}"'
+            success = await rcon_listener.send_command(rcon_command, "printpos", message.channel, player_name)
+            if success:
+                await message.channel.send(f"📍 Getting position for: `{player_name}`")
+                print(f"Admin used printpos: {player_name}")
+            else:
+                await message.channel.send(_FAILED)
+        else:
+            await message.channel.send(_PRINTPOS_USAGE)
+
+async def handle_help(message, args: str):
+    """!help - show available commands"""
+    await message.channel.send(_HELP_TEXT)
+
+# Command name -> handler, each handler takes (message, args)
+COMMANDS = {
+    'players': handle_players,
+    'time': handle_time,
+    'say': handle_say,
+    'givedrop': handle_givedrop,
+    'giveto': handle_giveto,
+    'spawn': handle_spawn,
+    'printpos': handle_printpos,
+    'help': handle_help,
+}
+_KNOWN = frozenset(COMMANDS)
+
+@bot.event
+async def on_message(message):
+    # Ignore messages from the bot itself
+    if message.author == bot.user:
         return
     
-    # Extract data from message
-    message = message_data.get("message", "")
-    message_type = message_data.get("message_type", "")
-    identifier = message_data.get("identifier", "")
-    raw_data = message_data.get("raw_data", {})
+    # Only respond in admin channel
+    if message.channel.id != ADMIN_CHANNEL_ID:
+        return
+    
+    # Handle commands
+    if message.content.startswith('!'):
+        content = message.content[1:].strip()
+        # The command name ends at any whitespace (space, tab, newline)
+        parts = content.split(maxsplit=1)
+        cmd = parts[0] if parts else ''
+        args = parts[1] if len(parts) > 1 else ''
+        
+        # Ignore unknown commands
+        if cmd not in _KNOWN:
+            return
+        
+        await COMMANDS[cmd](message, args.strip())
+
+async def process_rcon_message(rcon_message: RCONMessage):
+    """Process a single parsed RCON message"""
+    global rcon_listener
     
-    # Print debug info
-    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    print(f"\n{'='*60}")
-    print(f"Message | {timestamp}")
-    print(f"Type: {message_type} | ID: {identifier}")
-    print(f"{'='*60}")
+    # Extract data from message
+    message = rcon_message.message
+    message_type = rcon_message.type
+    identifier = rcon_message.identifier
     
-    if message:
-        print(f"Message content: {repr(message)}")
+    # Debug info (skipped entirely unless DEBUG logging is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Message | Type: %s | ID: %s", message_type, identifier)
+        if message:
+            logger.debug("Message content: %r", message)
     
     if not message:
         return
     
-    # Check if this is a response to a command we sent
-    if identifier in rcon_listener.pending_responses:
-        command_info = rcon_listener.pending_responses[identifier]
-        command_type = command_info.get("type", "")
-        discord_channel = command_info.get("channel")
-        original_message = command_info.get("message", "")
+    # Check if this is a response to a command we sent (int keys, same as command_counter)
+    pending = rcon_listener.pending_responses.pop(identifier, None)
+    if pending:
+        command_type, discord_channel, original_message, _ = pending
         
         response_text = format_command_response(command_type, message, original_message)
         
         if response_text and discord_channel:
             await discord_channel.send(response_text)
-        
-        del rcon_listener.pending_responses[identifier]
 
 # Run the bot
-bot.run(TOKEN)
+if uvloop:
+    uvloop.install()
+bot.run(TOKEN, log_handler=None)  # logging is already configured above
@@ -2,10 +2,13 @@ import discord
 import asyncio
 import os
 import re
+import random
 import configparser
-import json
+import orjson
 import websockets
-from typing import Optional, Dict, Set
+from websockets.asyncio.client import connect, ClientConnection
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -19,20 +22,158 @@ RCON_PORT = int(os.getenv('RCON_PORT'))
 RCON_PASSWORD = os.getenv('RCON_PASSWORD')
 LOGS_CHANNEL_ID = int(os.getenv('LOGS_CHANNEL'))
 
+# How many recent chat messages to remember for de-duplication
+CHAT_SEEN_MAX = 4096
+
+# How often to sweep expired emote cooldowns (seconds)
+COOLDOWN_SWEEP_INTERVAL = 300
+
+# Coalesce coordinate saves made within this window into one file write (seconds)
+COORDS_FLUSH_DELAY = 0.5
+
+# Log lines sent within this window go out as one Discord message (seconds)
+LOGS_FLUSH_DELAY = 0.5
+
+# Discord's message length limit
+DISCORD_MESSAGE_MAX = 2000
+
+# Bump when the parsed emote config layout changes so old sidecar caches are ignored
+CONFIG_CACHE_VERSION = 1
+
+# Received RCON frames waiting to be processed; recv waits when this fills up
+MESSAGE_QUEUE_MAX = 256
+
+# Reconnect delay doubles from the first value up to the cap, plus up to 1s of jitter (seconds)
+RECONNECT_BACKOFF_START = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Kinds of pre-parsed emote commands
+CMD_PLAIN = 0
+CMD_PRINTPOS = 1
+CMD_TELEPORTPOS = 2
+
+# Coordinates in a printpos response, e.g. (10.5, 20.0, -30.25)
+_COORD_RE = re.compile(r'\(([-\d\.]+),\s*([-\d\.]+),\s*([-\d\.]+)\)')
+
+# One line of the emote config: [section], time = N, or a command (comments/blank lines don't match)
+_INI_RE = re.compile(r'^[ \t]*(?:\[(?P<section>.*)\]|time =(?P<time>.*?)|(?P<cmd>[^#\s].*?))[ \t]*$', re.M)
+
+# A player position as (x, y, z)
+Position = Tuple[float, float, float]
+
+# Every quick chat emote token starts with this, so chat without it can skip the emote scan
+_EMOTE_PREFIX = 'd11_quick_chat_'
+
+# Every quick chat emote the game can send
+_ALL_EMOTES = (
+    # Combat slots
+    "d11_quick_chat_combat_slot_0",
+    "d11_quick_chat_combat_slot_1",
+    "d11_quick_chat_combat_slot_2",
+    "d11_quick_chat_combat_slot_3",
+    "d11_quick_chat_combat_slot_4",
+    "d11_quick_chat_combat_slot_5",
+    "d11_quick_chat_combat_slot_6",
+    "d11_quick_chat_combat_slot_7",
+
+    # Building slots
+    "d11_quick_chat_building_slot_0",
+    "d11_quick_chat_building_slot_1",
+    "d11_quick_chat_building_slot_2",
+    "d11_quick_chat_building_slot_3",
+    "d11_quick_chat_building_slot_4",
+    "d11_quick_chat_building_slot_5",
+    "d11_quick_chat_building_slot_6",
+    "d11_quick_chat_building_slot_7",
+
+    # Activities phrase format
+    "d11_quick_chat_activities_phrase_format d11_Stone",
+    "d11_quick_chat_activities_phrase_format d11_Wood",
+    "d11_quick_chat_activities_phrase_format d11_Metal",
+    "d11_quick_chat_activities_phrase_format d11_Food",
+    "d11_quick_chat_activities_phrase_format d11_Water",
+    "d11_quick_chat_activities_phrase_format d11_Scrap",
+    "d11_quick_chat_activities_phrase_format d11_Metal_Fragments",
+    "d11_quick_chat_activities_phrase_format d11_Medicine",
+
+    # Questions slots
+    "d11_quick_chat_questions_slot_0",
+    "d11_quick_chat_questions_slot_1",
+    "d11_quick_chat_questions_slot_2",
+    "d11_quick_chat_questions_slot_3",
+    "d11_quick_chat_questions_slot_4",
+    "d11_quick_chat_questions_slot_5",
+    "d11_quick_chat_questions_slot_6",
+    "d11_quick_chat_questions_slot_7",
+
+    # Responses slots
+    "d11_quick_chat_responses_slot_0",
+    "d11_quick_chat_responses_slot_1",
+    "d11_quick_chat_responses_slot_2",
+    "d11_quick_chat_responses_slot_3",
+    "d11_quick_chat_responses_slot_4",
+    "d11_quick_chat_responses_slot_5",
+    "d11_quick_chat_responses_slot_6",
+    "d11_quick_chat_responses_slot_7",
+
+    # Orders slots
+    "d11_quick_chat_orders_slot_0",
+    "d11_quick_chat_orders_slot_1",
+    "d11_quick_chat_orders_slot_2",
+    "d11_quick_chat_orders_slot_3",
+    "d11_quick_chat_orders_slot_4",
+    "d11_quick_chat_orders_slot_5",
+    "d11_quick_chat_orders_slot_6",
+    "d11_quick_chat_orders_slot_7",
+
+    # Location slots
+    "d11_quick_chat_location_slot_0",
+    "d11_quick_chat_location_slot_1",
+    "d11_quick_chat_location_slot_2",
+    "d11_quick_chat_location_slot_3",
+    "d11_quick_chat_location_slot_4",
+    "d11_quick_chat_location_slot_5",
+    "d11_quick_chat_location_slot_6",
+    "d11_quick_chat_location_slot_7",
+
+    # I need phrase format
+    "d11_quick_chat_i_need_phrase_format scrap",
+    "d11_quick_chat_i_need_phrase_format lowgradefuel",
+    "d11_quick_chat_i_need_phrase_format d11_Food",
+    "d11_quick_chat_i_need_phrase_format water",
+    "d11_quick_chat_i_need_phrase_format wood",
+    "d11_quick_chat_i_need_phrase_format stones",
+    "d11_quick_chat_i_need_phrase_format metal.fragments",
+    "d11_quick_chat_i_need_phrase_format metal.refined",
+
+    # I have phrase format
+    "d11_quick_chat_i_have_phrase_format scrap",
+    "d11_quick_chat_i_have_phrase_format lowgradefuel",
+    "d11_quick_chat_i_have_phrase_format d11_Food",
+    "d11_quick_chat_i_have_phrase_format water",
+    "d11_quick_chat_i_have_phrase_format bow.hunting",
+    "d11_quick_chat_i_have_phrase_format pickaxe",
+    "d11_quick_chat_i_have_phrase_format hatchet",
+    "d11_quick_chat_i_have_phrase_format metal.refined"
+)
+
 class RCONListener:
     """RCON WebSocket client that listens to ALL server messages"""
     
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.websocket: Optional[ClientConnection] = None
         self.command_counter = 1
         self.is_connected = False
+        self._msg_queue: Optional[asyncio.Queue] = None
+        self._backoff = RECONNECT_BACKOFF_START
     
     async def connect(self) -> bool:
         """Establish connection to server"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # Keepalive pings notice a dead server instead of hanging on recv
+            self.websocket = await connect(self.uri, ping_interval=20, ping_timeout=20)
             self.is_connected = True
             print("Connected successfully")
             
@@ -43,7 +184,7 @@ class RCONListener:
                 "Type": "Command",
                 "Stacktrace": None
             }
-            await self.websocket.send(json.dumps(init_data))
+            await self.websocket.send(orjson.dumps(init_data).decode())
             
             return True
         except Exception as e:
@@ -52,40 +193,62 @@ class RCONListener:
             return False
     
     async def listen_continuously(self, process_callback):
-        """Listen continuously for messages and call the callback for each"""
+        """Listen continuously for messages and hand each one to the callback"""
+        # Processing runs in its own task so slow callbacks (Discord, files) never stall recv.
+        # One consumer keeps messages in order, printpos replies rely on that
+        self._msg_queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_MAX)
+        consumer = asyncio.create_task(self._consume(process_callback))
+        try:
+            while True:
+                try:
+                    if not self.is_connected or not self.websocket:
+                        print("Not connected, reconnecting...")
+                        if not await self.connect():
+                            await self._wait_backoff()
+                            continue
+                    
+                    # Wait for message, then queue it (waits here if processing falls far behind)
+                    raw_response = await self.websocket.recv()
+                    self._backoff = RECONNECT_BACKOFF_START
+                    await self._msg_queue.put(raw_response)
+                    
+                except websockets.exceptions.ConnectionClosed:
+                    print("Connection closed, reconnecting...")
+                    self.is_connected = False
+                    await self._wait_backoff()
+                except Exception as e:
+                    print(f"Error listening: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            consumer.cancel()
+    
+    async def _wait_backoff(self):
+        """Sleep before the next reconnect, backing off further each failed attempt"""
+        await asyncio.sleep(self._backoff + random.random())
+        self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+    
+    async def _consume(self, process_callback):
+        """Decode queued frames and call the callback for each message"""
         while True:
+            raw_response = await self._msg_queue.get()
             try:
-                if not self.is_connected or not self.websocket:
-                    print("Not connected, reconnecting...")
-                    if not await self.connect():
-                        await asyncio.sleep(5)
-                        continue
+                response_data = orjson.loads(raw_response)
+                message = response_data.get("Message", "")
                 
-                # Wait for message
-                raw_response = await self.websocket.recv()
+                if isinstance(message, str):
+                    # Only pay for the replace when there is a NUL to remove
+                    if "\u0000" in message:
+                        message = message.replace("\u0000", "")
+                    message = message.strip()
                 
-                # Process the message
-                try:
-                    response_data = json.loads(raw_response)
-                    message = response_data.get("Message", "")
+                # Call the callback with the message
+                if message and process_callback:
+                    await process_callback(message)
                     
-                    if isinstance(message, str):
-                        message = message.replace("\u0000", "").strip()
-                    
-                    # Call the callback with the message
-                    if message and process_callback:
-                        await process_callback(message)
-                        
-                except json.JSONDecodeError:
-                    print(f"Non-JSON message: {raw_response}")
-                    
-            except websockets.exceptions.ConnectionClosed:
-                print("Connection closed, reconnecting...")
-                self.is_connected = False
-                await asyncio.sleep(5)
+            except orjson.JSONDecodeError:
+                print(f"Non-JSON message: {raw_response}")
             except Exception as e:
-                print(f"Error listening: {e}")
-                await asyncio.sleep(1)
+                print(f"Error processing message: {e}")
     
     async def send_command(self, command: str) -> bool:
         """Send command to WebSocket RCON server"""
@@ -101,7 +264,7 @@ class RCONListener:
                 "Stacktrace": None
             }
             
-            await self.websocket.send(json.dumps(command_data))
+            await self.websocket.send(orjson.dumps(command_data).decode())
             self.command_counter += 1
             return True
             
@@ -110,6 +273,44 @@ class RCONListener:
             self.is_connected = False
             return False
     
+    async def send_commands(self, commands: List[str]) -> List[bool]:
+        """Send several commands concurrently, returns whether each one was sent"""
+        try:
+            if not self.is_connected or not self.websocket:
+                if not await self.connect():
+                    return [False] * len(commands)
+            
+            # Encode everything up front, then write the frames in one go
+            payloads = []
+            for command in commands:
+                payloads.append(orjson.dumps({
+                    "Message": command,
+                    "Identifier": self.command_counter,
+                    "Type": "Command",
+                    "Stacktrace": None
+                }).decode())
+                self.command_counter += 1
+            
+            # WebRCON takes one command per frame; one failed frame doesn't stop the rest
+            results = await asyncio.gather(
+                *(self.websocket.send(payload) for payload in payloads),
+                return_exceptions=True
+            )
+            sent = []
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error sending to RCON: {result}")
+                    self.is_connected = False
+                    sent.append(False)
+                else:
+                    sent.append(True)
+            return sent
+            
+        except Exception as e:
+            print(f"Error sending to RCON: {e}")
+            self.is_connected = False
+            return [False] * len(commands)
+    
     async def close(self) -> None:
         """Close the connection"""
         if self.websocket:
@@ -121,176 +322,171 @@ class EmoteManager:
     """Manages emote commands and cooldowns"""
     
     def __init__(self):
-        self.emote_cooldowns: Dict[str, datetime] = {}
-        self.coordinates_config = configparser.ConfigParser()
+        self.emote_cooldowns: Dict[Tuple[str, str], datetime] = {}
+        self._coords: Dict[str, Position] = {}  # player -> (x, y, z)
         self.emotes_data: Dict = {}
-        self.COORDINATES_FILE = 'player_coordinates.ini'
+        self._emote_pattern: Optional[re.Pattern] = None
+        self._emote_prefix = _EMOTE_PREFIX
+        self._emote_commands: Dict[str, List[Tuple[int, Tuple[str, ...]]]] = {}
+        self.COORDINATES_FILE = 'player_coordinates.json'
+        self.LEGACY_COORDINATES_FILE = 'player_coordinates.ini'
         self.EMOTES_FILE = 'emote_commands.ini'
         self.current_printpos_player: Optional[str] = None
-        self.processed_chat_ids: Set[str] = set()
+        self.processed_chat_ids: OrderedDict = OrderedDict()  # bounded LRU of seen (user_id, time, message) keys
         self.start_time = datetime.now()
+        self._coords_dirty = False
+        self._coords_flush_task: Optional[asyncio.Task] = None
+        self._log_queue: List[str] = []
+        self._log_flush_task: Optional[asyncio.Task] = None
         
         # List of ALL emotes
-        self.ALL_EMOTES = self._get_all_emotes()
+        self.ALL_EMOTES = _ALL_EMOTES
         
-        # Load configurations
-        self._load_configurations()
-    
-    def _get_all_emotes(self):
-        """Get list of ALL emotes"""
-        return [
-            # Combat slots
-    "d11_quick_chat_combat_slot_0", 
-    "d11_quick_chat_combat_slot_1", 
-    "d11_quick_chat_combat_slot_2", 
-    "d11_quick_chat_combat_slot_3", 
-    "d11_quick_chat_combat_slot_4", 
-    "d11_quick_chat_combat_slot_5", 
-    "d11_quick_chat_combat_slot_6", 
-    "d11_quick_chat_combat_slot_7",
-    
-    # Building slots
-    "d11_quick_chat_building_slot_0", 
-    "d11_quick_chat_building_slot_1", 
-    "d11_quick_chat_building_slot_2", 
-    "d11_quick_chat_building_slot_3", 
-    "d11_quick_chat_building_slot_4", 
-    "d11_quick_chat_building_slot_5", 
-    "d11_quick_chat_building_slot_6", 
-    "d11_quick_chat_building_slot_7",
-    
-    # Activities phrase format
-    "d11_quick_chat_activities_phrase_format d11_Stone",
-    "d11_quick_chat_activities_phrase_format d11_Wood",
-    "d11_quick_chat_activities_phrase_format d11_Metal",
-    "d11_quick_chat_activities_phrase_format d11_Food",
-    "d11_quick_chat_activities_phrase_format d11_Water",
-    "d11_quick_chat_activities_phrase_format d11_Scrap",
-    "d11_quick_chat_activities_phrase_format d11_Metal_Fragments",
-    "d11_quick_chat_activities_phrase_format d11_Medicine",
+        # Configurations are loaded by load(), off the event loop
     
-    # Questions slots
-    "d11_quick_chat_questions_slot_0", 
-    "d11_quick_chat_questions_slot_1", 
-    "d11_quick_chat_questions_slot_2", 
-    "d11_quick_chat_questions_slot_3", 
-    "d11_quick_chat_questions_slot_4", 
-    "d11_quick_chat_questions_slot_5", 
-    "d11_quick_chat_questions_slot_6", 
-    "d11_quick_chat_questions_slot_7",
-    
-    # Responses slots
-    "d11_quick_chat_responses_slot_0", 
-    "d11_quick_chat_responses_slot_1", 
-    "d11_quick_chat_responses_slot_2", 
-    "d11_quick_chat_responses_slot_3", 
-    "d11_quick_chat_responses_slot_4", 
-    "d11_quick_chat_responses_slot_5", 
-    "d11_quick_chat_responses_slot_6", 
-    "d11_quick_chat_responses_slot_7",
-    
-    # Orders slots
-    "d11_quick_chat_orders_slot_0", 
-    "d11_quick_chat_orders_slot_1", 
-    "d11_quick_chat_orders_slot_2", 
-    "d11_quick_chat_orders_slot_3", 
-    "d11_quick_chat_orders_slot_4", 
-    "d11_quick_chat_orders_slot_5", 
-    "d11_quick_chat_orders_slot_6", 
-    "d11_quick_chat_orders_slot_7",
-    
-    # Location slots
-    "d11_quick_chat_location_slot_0", 
-    "d11_quick_chat_location_slot_1", 
-    "d11_quick_chat_location_slot_2", 
-    "d11_quick_chat_location_slot_3", 
-    "d11_quick_chat_location_slot_4", 
-    "d11_quick_chat_location_slot_5", 
-    "d11_quick_chat_location_slot_6", 
-    "d11_quick_chat_location_slot_7", 
-    
-    # I need phrase format
-    "d11_quick_chat_i_need_phrase_format scrap",
-    "d11_quick_chat_i_need_phrase_format lowgradefuel",
-    "d11_quick_chat_i_need_phrase_format d11_Food",
-    "d11_quick_chat_i_need_phrase_format water",
-    "d11_quick_chat_i_need_phrase_format wood",
-    "d11_quick_chat_i_need_phrase_format stones",
-    "d11_quick_chat_i_need_phrase_format metal.fragments",
-    "d11_quick_chat_i_need_phrase_format metal.refined",
-    
-    # I have phrase format
-    "d11_quick_chat_i_have_phrase_format scrap",
-    "d11_quick_chat_i_have_phrase_format lowgradefuel",
-    "d11_quick_chat_i_have_phrase_format d11_Food",
-    "d11_quick_chat_i_have_phrase_format water",
-    "d11_quick_chat_i_have_phrase_format bow.hunting",
-    "d11_quick_chat_i_have_phrase_format pickaxe",
-    "d11_quick_chat_i_have_phrase_format hatchet",
-    "d11_quick_chat_i_have_phrase_format metal.refined"
-        ]
+    async def load(self):
+        """Load (or create) the config files in a worker thread so the loop isn't blocked"""
+        await asyncio.to_thread(self._load_configurations)
     
     def _load_configurations(self):
         """Load coordinate and emote configurations"""
-        # Load existing coordinates
+        # Load existing coordinates, a flat {player: [x, y, z]} map
         if os.path.exists(self.COORDINATES_FILE):
-            self.coordinates_config.read(self.COORDINATES_FILE)
-            print(f"Loaded coordinates for {len(self.coordinates_config.sections())} players from file")
+            with open(self.COORDINATES_FILE, 'rb') as f:
+                saved = orjson.loads(f.read())
+            self._coords = {
+                player: position
+                for player, value in saved.items()
+                if (position := self._parse_position(value)) is not None
+            }
+            print(f"Loaded coordinates for {len(self._coords)} players from file")
+        elif os.path.exists(self.LEGACY_COORDINATES_FILE):
+            self._coords = self._read_legacy_coordinates()
+            self._write_coordinates_file(self._coords)
+            print(f"Converted coordinates for {len(self._coords)} players from {self.LEGACY_COORDINATES_FILE}")
         
         # Load or create emote configuration
         self._create_default_emotes_config()
         self.emotes_data = self._read_emote_config()
+        self._emote_pattern = self._build_emote_pattern()
+        # Custom sections may not be quick chat tokens; '' never rules a message out
+        self._emote_prefix = _EMOTE_PREFIX if all(_EMOTE_PREFIX in name for name in self.emotes_data) else ''
+        self._emote_commands = {
+            emote_name: self._compile_commands(data['commands'])
+            for emote_name, data in self.emotes_data.items()
+        }
         print(f"Loaded {len(self.emotes_data)} emote configurations from file")
     
+    def _build_emote_pattern(self) -> Optional[re.Pattern]:
+        """Compile all emote names into one pattern so a chat line is scanned once"""
+        if not self.emotes_data:
+            return None
+        # Longest names first so an emote is never shadowed by a shorter one
+        names = sorted(self.emotes_data, key=len, reverse=True)
+        return re.compile('|'.join(map(re.escape, names)))
+    
+    def _compile_commands(self, commands: List[str]) -> List[Tuple[int, Tuple[str, ...]]]:
+        """Pre-parse emote commands into (kind, parts) so nothing is re-parsed per use"""
+        compiled = []
+        for command in commands:
+            if not command.strip():
+                continue
+            if command.startswith('printpos'):
+                compiled.append((CMD_PRINTPOS, ()))
+            elif command.startswith('teleportpos'):
+                compiled.append((CMD_TELEPORTPOS, ()))
+            else:
+                # Joining the parts with the player name fills every {player}
+                compiled.append((CMD_PLAIN, tuple(command.split('{player}'))))
+        return compiled
+    
+    def _read_legacy_coordinates(self) -> Dict[str, Position]:
+        """Read coordinates saved by older versions in player_coordinates.ini"""
+        config = configparser.ConfigParser()
+        config.read(self.LEGACY_COORDINATES_FILE)
+        return {
+            section: position
+            for section in config.sections()
+            if (position := self._parse_position(config[section].get('position'))) is not None
+        }
+    
+    def _parse_position(self, value) -> Optional[Position]:
+        """Turn a saved position ([x, y, z] or an older "x,y,z" string) into a tuple"""
+        try:
+            if isinstance(value, str):
+                value = value.split(',')
+            x, y, z = map(float, value)
+            return (x, y, z)
+        except (TypeError, ValueError):
+            return None
+    
+    def _cache_key(self, path: str) -> list:
+        """Identify a version of a file by the cache format, its mtime and size"""
+        st = os.stat(path)
+        return [CONFIG_CACHE_VERSION, st.st_mtime_ns, st.st_size]
+    
+    def _load_cache(self, path: str) -> Optional[Dict]:
+        """Return the parsed data cached for path, or None if missing or stale"""
+        try:
+            with open(f"{path}.cache.json", 'rb') as f:
+                cache = orjson.loads(f.read())
+            if cache.get('key') == self._cache_key(path):
+                return cache['data']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+        return None
+    
+    def _save_cache(self, path: str, data: Dict):
+        """Store parsed data for path next to it as JSON"""
+        try:
+            with open(f"{path}.cache.json", 'wb') as f:
+                f.write(orjson.dumps({'key': self._cache_key(path), 'data': data}))
+        except OSError as e:
+            print(f"Error writing cache for {path}: {e}")
+    
     def _read_emote_config(self) -> Dict:
-        """Read emote configuration from file with custom parsing"""
-        emotes_data_dict = {}
-        
+        """Read emote configuration, using the JSON cache when it is still fresh"""
         if not os.path.exists(self.EMOTES_FILE):
-            return emotes_data_dict
+            return {}
+        
+        cached = self._load_cache(self.EMOTES_FILE)
+        if cached is not None:
+            return cached
+        
+        emotes_data_dict = self._parse_emote_config()
+        self._save_cache(self.EMOTES_FILE, emotes_data_dict)
+        return emotes_data_dict
+    
+    def _parse_emote_config(self) -> Dict:
+        """Parse emote configuration file with a single regex tokenizer"""
+        emotes_data_dict = {}
         
         with open(self.EMOTES_FILE, 'r') as f:
-            lines = f.readlines()
+            text = f.read()
         
-        current_section = None
-        time_value = '0'
-        commands = []
+        current = None
         
-        for line in lines:
-            line = line.strip()
-            
-            # Skip comments and empty lines
-            if not line or line.startswith('#'):
-                continue
+        # Comments and empty lines never match, so they are skipped by the tokenizer
+        for match in _INI_RE.finditer(text):
+            section, time_value, command = match.group('section', 'time', 'cmd')
             
             # Section header
-            if line.startswith('[') and line.endswith(']'):
-                # Save previous section if exists
-                if current_section:
-                    emotes_data_dict[current_section] = {
-                        'time': time_value,
-                        'commands': commands.copy()
-                    }
-                
-                # Start new section
-                current_section = line[1:-1]
-                time_value = '0'
-                commands = []
+            if section is not None:
+                current = None
+                if section:
+                    current = emotes_data_dict[section] = {'time': '0', 'commands': []}
+            
+            # Anything outside a section is ignored
+            elif current is None:
+                continue
             
             # Time setting
-            elif line.startswith('time ='):
-                time_value = line.split('=', 1)[1].strip()
+            elif time_value is not None:
+                current['time'] = time_value.strip()
             
             # Command (any other non-empty line in a section)
-            elif current_section and line:
-                commands.append(line)
-        
-        # Save the last section
-        if current_section:
-            emotes_data_dict[current_section] = {
-                'time': time_value,
-                'commands': commands.copy()
-            }
+            else:
+                current['commands'].append(command)
         
         return emotes_data_dict
     
@@ -308,58 +504,51 @@ class EmoteManager:
                     'commands': []
                 }
             
-            # Add example configurations for some emotes
+            # Add example configurations for some emotes (keys are known, assign directly)
             # Wood request (60 minute cooldown with commands)
-            if "d11_quick_chat_i_need_phrase_format wood" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_i_need_phrase_format wood"] = {
-                    'time': '60',
-                    'commands': [
-                        'giveto {player} wood 3000',
-                        'givedrop {player} stones 3000 3'
-                    ]
-                }
+            default_emotes_data["d11_quick_chat_i_need_phrase_format wood"] = {
+                'time': '60',
+                'commands': [
+                    'giveto {player} wood 3000',
+                    'givedrop {player} stones 3000 3'
+                ]
+            }
             
             # Building slot 1 (store position, 1 minute cooldown)
-            if "d11_quick_chat_building_slot_1" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_building_slot_1"] = {
-                    'time': '10',
-                    'commands': ['printpos {player}']
-                }
+            default_emotes_data["d11_quick_chat_building_slot_1"] = {
+                'time': '10',
+                'commands': ['printpos {player}']
+            }
             
             # Combat slot 1 (teleport to stored position, 10 min cooldown)
-            if "d11_quick_chat_combat_slot_1" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_combat_slot_1"] = {
-                    'time': '10',
-                    'commands': ['teleportpos {player}']
-                }
+            default_emotes_data["d11_quick_chat_combat_slot_1"] = {
+                'time': '10',
+                'commands': ['teleportpos {player}']
+            }
             
             # Metal fragments request (30 minute cooldown)
-            if "d11_quick_chat_i_need_phrase_format metal.fragments" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_i_need_phrase_format metal.fragments"] = {
-                    'time': '30',
-                    'commands': ['giveto {player} metal.fragments 1000']
-                }
+            default_emotes_data["d11_quick_chat_i_need_phrase_format metal.fragments"] = {
+                'time': '30',
+                'commands': ['giveto {player} metal.fragments 1000']
+            }
             
             # Water request (20 minute cooldown)
-            if "d11_quick_chat_i_need_phrase_format water" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_i_need_phrase_format water"] = {
-                    'time': '20',
-                    'commands': ['giveto {player} water 5']
-                }
+            default_emotes_data["d11_quick_chat_i_need_phrase_format water"] = {
+                'time': '20',
+                'commands': ['giveto {player} water 5']
+            }
             
             # Food request (20 minute cooldown)
-            if "d11_quick_chat_i_need_phrase_format d11_Food" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_i_need_phrase_format d11_Food"] = {
-                    'time': '20',
-                    'commands': ['giveto {player} can.beans 10']
-                }
+            default_emotes_data["d11_quick_chat_i_need_phrase_format d11_Food"] = {
+                'time': '20',
+                'commands': ['giveto {player} can.beans 10']
+            }
             
             # Scrap request (45 minute cooldown)
-            if "d11_quick_chat_i_need_phrase_format scrap" in default_emotes_data:
-                default_emotes_data["d11_quick_chat_i_need_phrase_format scrap"] = {
-                    'time': '45',
-                    'commands': ['giveto {player} scrap 500']
-                }
+            default_emotes_data["d11_quick_chat_i_need_phrase_format scrap"] = {
+                'time': '45',
+                'commands': ['giveto {player} scrap 500']
+            }
             
             # Save to file
             self._write_emote_config(default_emotes_data)
@@ -386,42 +575,64 @@ class EmoteManager:
                 
                 f.write("\n")
     
-    def extract_coordinates(self, line: str) -> Optional[str]:
-        """Extract coordinates from printpos response line"""
+    def extract_coordinates(self, line: str, match: Optional[re.Match] = None) -> Optional[Position]:
+        """Extract coordinates from printpos response line (or an existing match on it)"""
         try:
-            pattern = r'\(([-\d\.]+),\s*([-\d\.]+),\s*([-\d\.]+)\)'
-            match = re.search(pattern, line)
+            if match is None:
+                match = _COORD_RE.search(line)
             
             if match:
                 x, y, z = match.groups()
-                return f"{x},{y},{z}"
+                return (float(x), float(y), float(z))
         except Exception as e:
             print(f"Error extracting coordinates: {e}")
         return None
     
-    def store_player_coordinates(self, player_name: str, coordinates: str) -> bool:
-        """Store or update coordinates for a player"""
+    def store_player_coordinates(self, player_name: str, coordinates: Position) -> bool:
+        """Store or update coordinates for a player, the file is written shortly after"""
         try:
-            if not self.coordinates_config.has_section(player_name):
-                self.coordinates_config.add_section(player_name)
-            
-            self.coordinates_config.set(player_name, 'position', coordinates)
+            self._coords[player_name] = coordinates
             
-            with open(self.COORDINATES_FILE, 'w') as configfile:
-                self.coordinates_config.write(configfile)
+            # Debounced write off the event loop
+            self._coords_dirty = True
+            if self._coords_flush_task is None or self._coords_flush_task.done():
+                self._coords_flush_task = asyncio.create_task(self._flush_coordinates())
             
-            print(f"Stored coordinates for {player_name}: {coordinates}")
+            print(f"Stored coordinates for {player_name}: {self.format_position(coordinates)}")
             return True
             
         except Exception as e:
             print(f"Error storing coordinates: {e}")
             return False
     
-    def get_player_coordinates(self, player_name: str) -> Optional[str]:
+    async def _flush_coordinates(self):
+        """Write coordinates to file once saves settle, repeating if more arrive meanwhile"""
+        await asyncio.sleep(COORDS_FLUSH_DELAY)
+        while self._coords_dirty:
+            self._coords_dirty = False
+            # Snapshot on the loop so the writer thread never sees a half-updated dict
+            snapshot = dict(self._coords)
+            try:
+                await asyncio.to_thread(self._write_coordinates_file, snapshot)
+            except Exception as e:
+                print(f"Error storing coordinates: {e}")
+    
+    def _write_coordinates_file(self, snapshot: Dict):
+        """Write a coordinates snapshot to COORDINATES_FILE (runs in a worker thread)"""
+        # Write beside it and swap in, so a crash mid-write never leaves a truncated file
+        tmp_path = f"{self.COORDINATES_FILE}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(snapshot))
+        os.replace(tmp_path, self.COORDINATES_FILE)
+    
+    def get_player_coordinates(self, player_name: str) -> Optional[Position]:
         """Get stored coordinates for a player"""
-        if self.coordinates_config.has_section(player_name):
-            return self.coordinates_config.get(player_name, 'position', fallback=None)
-        return None
+        return self._coords.get(player_name)
+    
+    def format_position(self, position: Position) -> str:
+        """Format a position the way teleportpos takes it: x,y,z"""
+        x, y, z = position
+        return f"{x},{y},{z}"
     
     async def handle_emote_request(self, rcon_listener, logs_channel, player_name: str, emote_name: str):
         """Handle emote request with cooldown check and command execution"""
@@ -444,14 +655,17 @@ class EmoteManager:
             return
         
         # Create a unique key for player+emote cooldown
-        cooldown_key = f"{player_name}_{emote_name}"
+        cooldown_key = (player_name, emote_name)
         
         # Check if player is on cooldown for this emote
         if cooldown_key in self.emote_cooldowns:
             last_request = self.emote_cooldowns[cooldown_key]
             time_diff = current_time - last_request
             
-            if time_diff < timedelta(minutes=cooldown_minutes):
+            if time_diff >= timedelta(minutes=cooldown_minutes):
+                # Expired, drop it now rather than waiting for the sweep
+                self.emote_cooldowns.pop(cooldown_key, None)
+            else:
                 # Still on cooldown
                 cooldown_left = timedelta(minutes=cooldown_minutes) - time_diff
                 minutes_left = int(cooldown_left.total_seconds() / 60)
@@ -462,8 +676,8 @@ class EmoteManager:
                 await self._send_to_logs(logs_channel, message)
                 return
         
-        # Get commands from config
-        commands = self.emotes_data[emote_name]['commands']
+        # Get pre-parsed commands from config
+        commands = self._emote_commands[emote_name]
         
         # Track if any commands were successfully executed
         commands_executed = 0
@@ -471,43 +685,43 @@ class EmoteManager:
         
         # Handle commands
         if commands:
-            # Execute each command
-            for command in commands:
-                if not command.strip():
-                    continue
+            # Build every command first so they go out in one batch
+            to_send = []
+            printpos_index = None
+            for kind, parts in commands:
+                if kind == CMD_PLAIN:
+                    # Regular command (giveto, givedrop, etc.)
+                    formatted_command = player_name.join(parts)
                     
-                # Replace {player} placeholder with actual player name
-                formatted_command = command.replace('{player}', player_name)
-                
-                # Special handling for specific commands
-                if command.startswith('printpos'):
+                elif kind == CMD_PRINTPOS:
                     # Add quotes for printpos command
                     formatted_command = f'printpos "{player_name}"'
-                    if await rcon_listener.send_command(formatted_command):
-                        commands_executed += 1
-                        print(f"Executed command for {player_name}: {formatted_command}")
-                        
-                        # Store player name for coordinate response
-                        self.current_printpos_player = player_name
+                    printpos_index = len(to_send)
                     
-                elif command.startswith('teleportpos'):
+                else:
                     # Teleport player to their stored coordinates
                     coordinates = self.get_player_coordinates(player_name)
                     if coordinates:
-                        formatted_command = f'teleportpos {coordinates} "{player_name}"'
-                        if await rcon_listener.send_command(formatted_command):
-                            commands_executed += 1
-                            print(f"Executed command for {player_name}: {formatted_command}")
+                        formatted_command = f'teleportpos {self.format_position(coordinates)} "{player_name}"'
                     else:
                         # Mark teleport as failed but don't send message yet
                         teleport_failed = True
                         # Don't count this as executed since it failed
                         continue
-                else:
-                    # Regular command (giveto, givedrop, etc.)
-                    if await rcon_listener.send_command(formatted_command):
-                        commands_executed += 1
+                
+                to_send.append(formatted_command)
+            
+            if to_send:
+                # Failed sends can be anywhere in the list, so go by each command's own result
+                sent = await rcon_listener.send_commands(to_send)
+                for formatted_command, ok in zip(to_send, sent):
+                    if ok:
                         print(f"Executed command for {player_name}: {formatted_command}")
+                commands_executed = sum(sent)
+                
+                # Store player name for coordinate response
+                if printpos_index is not None and sent[printpos_index]:
+                    self.current_printpos_player = player_name
             
             # Only update cooldown if commands were successfully executed
             if commands_executed > 0:
@@ -537,52 +751,123 @@ class EmoteManager:
             await self._send_to_logs(logs_channel, log_message)
             return
     
+    def prune_cooldowns(self):
+        """Drop cooldowns that are older than the longest configured cooldown"""
+        max_minutes = 0
+        for data in self.emotes_data.values():
+            try:
+                max_minutes = max(max_minutes, int(data['time']))
+            except ValueError:
+                pass
+        
+        cutoff = datetime.now() - timedelta(minutes=max_minutes)
+        expired = [key for key, used_at in self.emote_cooldowns.items() if used_at < cutoff]
+        for key in expired:
+            del self.emote_cooldowns[key]
+        
+        if expired:
+            print(f"Pruned {len(expired)} expired emote cooldowns")
+    
+    async def prune_cooldowns_forever(self):
+        """Periodically sweep expired cooldowns so the dict doesn't grow forever"""
+        while True:
+            await asyncio.sleep(COOLDOWN_SWEEP_INTERVAL)
+            self.prune_cooldowns()
+    
     async def _send_to_logs(self, logs_channel, message: str):
-        """Send message to logs channel"""
+        """Queue message for the logs channel, it is sent with any others shortly after"""
         if logs_channel:
-            try:
-                await logs_channel.send(message)
-            except Exception as e:
-                print(f"Error sending to logs Discord: {e}")
+            self._log_queue.append(message)
+            if self._log_flush_task is None or self._log_flush_task.done():
+                self._log_flush_task = asyncio.create_task(self._flush_logs(logs_channel))
+    
+    async def _flush_logs(self, logs_channel):
+        """Send queued log lines in as few Discord messages as the length limit allows,
+        repeating if more are queued while sending"""
+        await asyncio.sleep(LOGS_FLUSH_DELAY)
+        while self._log_queue:
+            lines, self._log_queue = self._log_queue, []
+            for chunk in self._chunk_log_lines(lines):
+                try:
+                    await logs_channel.send(chunk)
+                except Exception as e:
+                    print(f"Error sending to logs Discord: {e}")
+    
+    @staticmethod
+    def _chunk_log_lines(lines: List[str]) -> List[str]:
+        """Join lines in order into messages of at most DISCORD_MESSAGE_MAX characters"""
+        chunks = []
+        current = ''
+        for line in lines:
+            # A single oversized line is split on its own
+            while len(line) > DISCORD_MESSAGE_MAX:
+                if current:
+                    chunks.append(current)
+                    current = ''
+                chunks.append(line[:DISCORD_MESSAGE_MAX])
+                line = line[DISCORD_MESSAGE_MAX:]
+            if not current:
+                current = line
+            elif len(current) + 1 + len(line) <= DISCORD_MESSAGE_MAX:
+                current = f"{current}\n{line}"
+            else:
+                chunks.append(current)
+                current = line
+        if current:
+            chunks.append(current)
+        return chunks
     
     async def process_message(self, rcon_listener, logs_channel, message: str):
         """Process incoming RCON message"""
-        # Check for chat messages
-        if message.strip().startswith('{'):
+        # Check for chat messages (the listener already stripped the message)
+        if message[:1] == '{':
             try:
-                chat_data = json.loads(message)
+                chat_data = orjson.loads(message)
                 username = chat_data.get("Username", "")
                 message_content = chat_data.get("Message", "").strip()
                 user_id = chat_data.get("UserId", 0)
                 timestamp = chat_data.get("Time", 0)
                 
-                chat_id = f"{user_id}_{timestamp}_{message_content}"
+                chat_id = (user_id, timestamp, message_content)
                 
                 if chat_id in self.processed_chat_ids:
+                    self.processed_chat_ids.move_to_end(chat_id)
                     return
                 
-                self.processed_chat_ids.add(chat_id)
+                self.processed_chat_ids[chat_id] = None
+                if len(self.processed_chat_ids) > CHAT_SEEN_MAX:
+                    self.processed_chat_ids.popitem(last=False)
                 print(f"Chat: {username} - {message_content}")
                 
-                # Check for any emote in the message
-                for emote_name in self.emotes_data.keys():
-                    if emote_name in message_content:
+                # Most chat has no quick chat token at all, so skip the scan
+                if self._emote_prefix not in message_content:
+                    return
+                
+                # Check for any emote in the message (one scan for all emotes)
+                if self._emote_pattern:
+                    match = self._emote_pattern.search(message_content)
+                    if match:
+                        emote_name = match.group(0)
                         print(f"Found emote in chat: {emote_name}")
                         await self.handle_emote_request(rcon_listener, logs_channel, username, emote_name)
                         return  # Process only one emote per chat message
                         
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
         
+        # Coordinate responses only matter right after we issued a printpos
+        elif self.current_printpos_player is None:
+            return
+        
         # Check for coordinate responses from printpos command
-        elif re.search(r'\([-\d\.]+,\s*[-\d\.]+,\s*[-\d\.]+\)', message):
+        elif coord_match := _COORD_RE.search(message):
             print(f"Found possible coordinates in message: {message}")
-            coordinates = self.extract_coordinates(message)
+            coordinates = self.extract_coordinates(message, coord_match)
             if coordinates and self.current_printpos_player:
                 player_name = self.current_printpos_player
                 self.store_player_coordinates(player_name, coordinates)
                 
-                log_message = f"📍 Saved coordinates for {player_name}: `{coordinates}`"
+                log_message = f"📍 Saved coordinates for {player_name}: `{self.format_position(coordinates)}`"
                 print(log_message)
                 await self._send_to_logs(logs_channel, log_message)
                 
@@ -609,7 +894,9 @@ async def on_ready():
     
     # Initialize managers
     emote_manager = EmoteManager()
+    await emote_manager.load()
     rcon_listener = RCONListener(SERVER_IP, RCON_PORT, RCON_PASSWORD)
+    bot.loop.create_task(emote_manager.prune_cooldowns_forever())
     
     # Connect and start listening
     if await rcon_listener.connect():
@@ -1,12 +1,24 @@
 import discord
 import os
 import re
-import json
+import msgspec
 import websockets
+from websockets.asyncio.client import connect, ClientConnection
 import asyncio
-from typing import Optional
-from datetime import datetime
+import logging
+from typing import Optional, Dict, List, Tuple
 from dotenv import load_dotenv
+from timestamps import format_timestamp
+
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Setup logging (set to DEBUG to dump every RCON message)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
@@ -31,33 +43,76 @@ if MODS_CHANNEL_ID is None:
     print("ERROR: No valid MODS channel ID found!")
     exit(1)
 
+# How long to wait for the server to answer a command (seconds)
+RESPONSE_TIMEOUT = 5.0
+
+# Decoded messages waiting for the callback; new ones are dropped when it is full
+INBOX_MAX = 1024
+
+# Replies for the same channel within this window go out as one Discord message (seconds)
+SEND_FLUSH_DELAY = 0.1
+
+# Discord's message length limit
+DISCORD_MESSAGE_MAX = 2000
+
+# A frame that carries nothing (keep-alive), and the first byte of a real frame
+_EMPTY_FRAME = b'{}'
+_FRAME_START = b'{'
+
+# Precompiled patterns
+_COORD_RE = re.compile(r'\(([-\d\.]+),\s*([-\d\.]+),\s*([-\d\.]+)\)')
+_PRINTPOS_QUOTED_RE = re.compile(r'printpos\s+"([^"]+)"')
+_PRINTPOS_BARE_RE = re.compile(r'printpos\s+(\S+)')
+_COORD_VALIDATE_RE = re.compile(r'^-?\d+(?:\.\d+)?,-?\d+(?:\.\d+)?,-?\d+(?:\.\d+)?$')
+
+# Translate table that deletes NUL characters in a single pass
+_NULL_TABLE = str.maketrans('', '', '\x00')
+
+# Initial command, constant so it is encoded once (sent as text, Rust's WebRCON ignores binary frames)
+_INIT_FRAME = msgspec.json.encode({
+    "Message": "",
+    "Identifier": 1,
+    "Type": "Command",
+    "Stacktrace": None
+}).decode()
+
+class RconFrame(msgspec.Struct):
+    """One WebRCON frame, decoded straight from JSON without an intermediate dict"""
+    Message: str = ""
+    Identifier: int = 0
+    Type: str = ""
+    Stacktrace: object = None
+
 class RCONListener:
     """RCON WebSocket client that listens to ALL server messages"""
     
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
-        self.command_counter = 1
+        self.websocket: Optional[ClientConnection] = None
+        self.command_counter = 2  # 1 is the init frame's ID
         self.is_connected = False
-        self.pending_responses = {}
-        self.processed_ids = set()  # Track processed message IDs to prevent duplicates
+        self.pending_responses: Dict[int, asyncio.Future] = {}  # command ID -> future for its reply
+        self._decoder = msgspec.json.Decoder(RconFrame)
+        self._encoder = msgspec.json.Encoder()
+        self._inbox: asyncio.Queue[Tuple[str, int]] = asyncio.Queue(maxsize=INBOX_MAX)
     
     async def connect(self) -> bool:
         """Establish connection to server"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # RCON frames are small and local, compression only costs CPU on every recv
+            self.websocket = await connect(
+                self.uri,
+                compression=None,
+                max_size=2**20,
+                max_queue=256,
+                open_timeout=5
+            )
             self.is_connected = True
             print("Connected successfully")
             
             # Send initial command
-            init_data = {
-                "Message": "",
-                "Identifier": 1,
-                "Type": "Command",
-                "Stacktrace": None
-            }
-            await self.websocket.send(json.dumps(init_data))
+            await self.websocket.send(_INIT_FRAME)
             
             return True
         except Exception as e:
@@ -66,7 +121,16 @@ class RCONListener:
             return False
     
     async def listen_continuously(self, process_callback):
-        """Listen continuously for messages"""
+        """Listen continuously for messages, the callback runs in a separate consumer task"""
+        # recv and decode stay in this loop, a slow callback never holds up the socket
+        consumer = asyncio.create_task(self._consume(process_callback))
+        try:
+            await self._receive_forever()
+        finally:
+            consumer.cancel()
+    
+    async def _receive_forever(self):
+        """Receive and decode frames, queueing each message for the consumer"""
         while True:
             try:
                 if not self.is_connected or not self.websocket:
@@ -75,33 +139,35 @@ class RCONListener:
                         await asyncio.sleep(5)
                         continue
                 
-                raw_response = await self.websocket.recv()
+                # Raw bytes: msgspec decodes them directly, no str built per frame
+                raw_response = await self.websocket.recv(decode=False)
+                
+                # Skip the parser for empty keep-alives and for data that can't be a frame
+                if not raw_response or raw_response == _EMPTY_FRAME:
+                    continue
+                if raw_response[:1] != _FRAME_START:
+                    self._print_non_json(raw_response)
+                    continue
                 
                 try:
-                    response_data = json.loads(raw_response)
-                    message = response_data.get("Message", "")
-                    identifier = response_data.get("Identifier", 0)
+                    frame = self._decoder.decode(raw_response)
+                    message = frame.Message.translate(_NULL_TABLE).strip()
+                    identifier = frame.Identifier
                     
-                    if isinstance(message, str):
-                        message = message.replace("\u0000", "").strip()
+                    # Debug output (skipped entirely unless DEBUG logging is on)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        timestamp = format_timestamp()
+                        logger.debug("Message #%s | %s", identifier, timestamp)
+                        if message:
+                            logger.debug("Message content: %r", message)
                     
-                    # Debug output
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                    print(f"\n{'='*60}")
-                    print(f"Message #{identifier} | {timestamp}")
-                    print(f"{'='*60}")
-                    if message:
-                        print(f"Message content: {repr(message)}")
-                    
-                    if process_callback:
-                        await process_callback(message, identifier)
+                    try:
+                        self._inbox.put_nowait((message, identifier))
+                    except asyncio.QueueFull:
+                        print(f"Inbox full, dropped message #{identifier}")
                         
-                except json.JSONDecodeError:
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                    print(f"\n{'='*60}")
-                    print(f"Non-JSON Message | {timestamp}")
-                    print(f"{'='*60}")
-                    print(f"Raw bytes: {repr(raw_response)}")
+                except msgspec.DecodeError:
+                    self._print_non_json(raw_response)
                     
             except websockets.exceptions.ConnectionClosed:
                 print("Connection closed, reconnecting...")
@@ -111,26 +177,46 @@ class RCONListener:
                 print(f"Error listening: {e}")
                 await asyncio.sleep(1)
     
-    async def send_command(self, command: str, command_type: str = "", discord_channel = None, discord_message: str = "") -> bool:
-        """Send command to WebSocket RCON server"""
+    async def _consume(self, process_callback):
+        """Hand queued messages to the callback in arrival order"""
+        while True:
+            message, identifier = await self._inbox.get()
+            if process_callback:
+                try:
+                    await process_callback(message, identifier)
+                except Exception as e:
+                    print(f"Error processing message: {e}")
+    
+    def _print_non_json(self, raw_response):
+        """Show a frame that isn't RCON JSON"""
+        timestamp = format_timestamp()
+        print(f"\n{'='*60}")
+        print(f"Non-JSON Message | {timestamp}")
+        print(f"{'='*60}")
+        print(f"Raw bytes: {repr(raw_response)}")
+    
+    async def send_command(self, command: str, response: Optional[asyncio.Future] = None) -> bool:
+        """Send command to WebSocket RCON server, the reply resolves response if given"""
+        current_id = None
         try:
-            print(f"DEBUG: Attempting to send command: {command}")
+            logger.debug("Attempting to send command: %s", command)
             
             if not self.is_connected or not self.websocket:
-                print(f"DEBUG: Not connected, attempting to connect...")
+                logger.debug("Not connected, attempting to connect...")
                 if not await self.connect():
-                    print(f"DEBUG: Connection failed!")
+                    logger.debug("Connection failed!")
                     return False
             
+            # Claim the ID before awaiting so concurrent commands never share one
             current_id = self.command_counter
+            self.command_counter += 1
             
-            if discord_channel:
-                print(f"DEBUG: Storing pending response for ID {current_id}")
-                self.pending_responses[current_id] = {
-                    "type": command_type,
-                    "channel": discord_channel,
-                    "message": discord_message or command
-                }
+            # Register before sending, the reply can arrive while send is still awaiting.
+            # A timed out (cancelled) future removes its own entry
+            if response is not None:
+                logger.debug("Storing pending response for ID %s", current_id)
+                self.pending_responses[current_id] = response
+                response.add_done_callback(lambda _: self.pending_responses.pop(current_id, None))
             
             command_data = {
                 "Message": command,
@@ -139,17 +225,32 @@ class RCONListener:
                 "Stacktrace": None
             }
             
-            print(f"DEBUG: Sending JSON: {json.dumps(command_data)}")
-            await self.websocket.send(json.dumps(command_data))
+            # Decode to the str text frame Rust's WebRCON expects
+            payload = self._encoder.encode(command_data).decode()
+            logger.debug("Sending JSON: %s", payload)
+            await self.websocket.send(payload)
             print(f"Sent command (ID {current_id}): {command}")
-            self.command_counter += 1
             return True
             
         except Exception as e:
             print(f"Error sending to RCON: {e}")
             self.is_connected = False
+            self.pending_responses.pop(current_id, None)
             return False
     
+    async def request(self, command: str, timeout: float = RESPONSE_TIMEOUT) -> Optional[str]:
+        """Send command and wait for the server's reply, None if it couldn't be sent.
+        Raises asyncio.TimeoutError if no reply comes within timeout"""
+        response = asyncio.get_running_loop().create_future()
+        if not await self.send_command(command, response):
+            return None
+        
+        try:
+            return await asyncio.wait_for(response, timeout)
+        except asyncio.TimeoutError:
+            print(f"No response to command: {command}")
+            raise
+    
     async def close(self) -> None:
         """Close the connection"""
         if self.websocket:
@@ -160,8 +261,7 @@ class RCONListener:
 def extract_coordinates(line: str) -> Optional[str]:
     """Extract coordinates from printpos response line"""
     try:
-        pattern = r'\(([-\d\.]+),\s*([-\d\.]+),\s*([-\d\.]+)\)'
-        match = re.search(pattern, line)
+        match = _COORD_RE.search(line)
         
         if match:
             x, y, z = match.groups()
@@ -172,6 +272,20 @@ def extract_coordinates(line: str) -> Optional[str]:
         print(f"Error extracting coordinates: {e}")
     return None
 
+# (prefix, suffix) wrapped around the server's reply for each command type
+_RESPONSE_FORMATS = {
+    "banlist": ("📋 **Ban List**:\n```\n", "\n```"),
+    "players": ("👥 **Players Online**:\n```\n", "\n```"),
+    "teleportpos": ("🚀 **Teleport** - ", ""),
+    "mutevoice": ("🔇 **Mutevoice** - ", ""),
+    "unmutevoice": ("🔊 **Unmutevoice** - ", ""),
+    "mutechat": ("🤐 **Mutechat** - ", ""),
+    "unmutechat": ("🗣️ **Unmutechat** - ", ""),
+    "banid": ("🔨 **Ban executed** - ", ""),
+    "kick": ("👢 **Kick executed** - ", ""),
+    "unban": ("✅ **Unban executed** - ", ""),
+}
+
 def format_command_response(command_type: str, server_response: str, original_message: str = "") -> Optional[str]:
     """Format server response for Discord"""
     server_response = server_response.strip()
@@ -180,75 +294,145 @@ def format_command_response(command_type: str, server_response: str, original_me
     if not server_response:
         return None
     
-    if command_type == "banlist":
-        return f"📋 **Ban List**:\n```\n{server_response}\n```"
-    
-    elif command_type == "players":
-        return f"👥 **Players Online**:\n```\n{server_response}\n```"
-    
-    elif command_type == "teleportpos":
-        return f"🚀 **Teleport** - {server_response}"
-    
-    elif command_type == "printpos":
+    if command_type == "printpos":
         coordinates = extract_coordinates(server_response)
         if coordinates:
             # Extract player name from original command
             player_name = "Unknown"
-            match = re.search(r'printpos\s+"([^"]+)"', original_message)
+            match = _PRINTPOS_QUOTED_RE.search(original_message)
             if match:
                 player_name = match.group(1)
             else:
                 # Try without quotes
-                match = re.search(r'printpos\s+(\S+)', original_message)
+                match = _PRINTPOS_BARE_RE.search(original_message)
                 if match:
                     player_name = match.group(1)
             return f"📍 **Position for {player_name}**: `{coordinates}`"
         else:
             return f"📍 **Position** - {server_response}"
     
-    elif command_type in ["mutevoice", "unmutevoice", "mutechat", "unmutechat"]:
-        emoji = {"mutevoice": "🔇", "unmutevoice": "🔊", "mutechat": "🤐", "unmutechat": "🗣️"}.get(command_type, "ℹ️")
-        return f"{emoji} **{command_type.title()}** - {server_response}"
-    
-    elif command_type == "banid":
-        return f"🔨 **Ban executed** - {server_response}"
-    
-    elif command_type == "kick":
-        return f"👢 **Kick executed** - {server_response}"
-    
-    elif command_type == "unban":
-        return f"✅ **Unban executed** - {server_response}"
+    response_format = _RESPONSE_FORMATS.get(command_type)
+    if response_format:
+        prefix, suffix = response_format
+        return f"{prefix}{server_response}{suffix}"
     
     return None
 
 async def process_rcon_message(bot, rcon_listener: RCONListener, message: str, identifier: int):
     """Process incoming RCON message"""
-    if not message:
+    # Hand the reply to whoever is waiting on this command, later duplicates find nothing.
+    # Empty replies (kick, mute, unban) still resolve it, format_command_response drops them
+    response = rcon_listener.pending_responses.pop(identifier, None)
+    if response is not None and not response.done():
+        response.set_result(message)
+
+async def reply_to_command(message, rcon_command: str, command_type: str):
+    """Run an RCON command and post the formatted reply in the command's channel"""
+    try:
+        server_response = await rcon_listener.request(rcon_command)
+    except asyncio.TimeoutError:
+        queue_send(message.channel, f"⏰ No response from the server to `{rcon_command}`")
         return
-    
-    # Skip if we've already processed this message ID
-    if identifier in rcon_listener.processed_ids:
-        print(f"DEBUG: Already processed ID {identifier}, skipping")
+    if server_response is None:
         return
     
-    # Check if this is a response to a command we sent
-    if identifier in rcon_listener.pending_responses:
-        # Mark as processed FIRST to prevent duplicates
-        rcon_listener.processed_ids.add(identifier)
-        
-        command_info = rcon_listener.pending_responses.pop(identifier)  # Remove immediately
-        command_type = command_info.get("type", "")
-        discord_channel = command_info.get("channel")
-        original_message = command_info.get("message", "")
-        
-        # Send formatted response
-        response_text = format_command_response(command_type, message, original_message)
-        
-        if response_text and discord_channel:
-            try:
-                await discord_channel.send(response_text)
-            except Exception as e:
-                print(f"Error sending response: {e}")
+    response_text = format_command_response(command_type, server_response, rcon_command)
+    
+    if response_text:
+        queue_send(message.channel, response_text)
+
+# Replies waiting to be sent, per channel
+_pending_sends: Dict[object, List[str]] = {}
+_send_flush_task: Optional[asyncio.Task] = None
+
+def queue_send(channel, text: str):
+    """Queue text for channel, it is sent together with any other replies shortly after"""
+    global _send_flush_task
+    _pending_sends.setdefault(channel, []).append(text)
+    if _send_flush_task is None or _send_flush_task.done():
+        _send_flush_task = asyncio.create_task(_flush_sends())
+
+async def _flush_sends():
+    """Send each channel's queued replies in as few messages as the length limit allows,
+    repeating if more are queued while sending"""
+    global _pending_sends
+    await asyncio.sleep(SEND_FLUSH_DELAY)
+    while _pending_sends:
+        pending, _pending_sends = _pending_sends, {}
+        for channel, texts in pending.items():
+            for chunk in chunk_messages(texts):
+                try:
+                    await channel.send(chunk)
+                except Exception as e:
+                    print(f"Error sending response: {e}")
+
+def split_long_message(text: str) -> List[str]:
+    """Split a message over the length limit by lines, keeping code blocks closed"""
+    if len(text) <= DISCORD_MESSAGE_MAX:
+        return [text]
+    
+    # Replies like "**Title**:\n```\nbody\n```" are re-wrapped in a code block per piece,
+    # unless the title alone leaves no room for a body
+    header, fence, body = text.partition("```\n")
+    in_block = bool(fence) and body.endswith("\n```")
+    if in_block and len(header) + len(fence) + 4 < DISCORD_MESSAGE_MAX:
+        body = body[:-4]
+        header += fence
+        opener, closer = "```\n", "\n```"
+    else:
+        header, body = "", text
+        opener = closer = ""
+    
+    pieces = []
+    limit = DISCORD_MESSAGE_MAX - len(closer)
+    # The first piece starts with the header, later ones with just the opener
+    prefix = header
+    lines = []
+    size = len(prefix)
+    
+    def flush():
+        nonlocal prefix, lines, size
+        # A piece with nothing but blank lines isn't worth a message, keep its prefix for the next
+        if any(lines):
+            pieces.append(prefix + "\n".join(lines) + closer)
+            prefix = opener
+        lines = []
+        size = len(prefix)
+    
+    for line in body.split("\n"):
+        while True:
+            sep = 1 if lines else 0
+            room = limit - size - sep
+            if len(line) <= room:
+                lines.append(line)
+                size += sep + len(line)
+                break
+            if lines:
+                flush()
+                continue
+            # A single line that can never fit is cut into slices
+            lines.append(line[:room])
+            line = line[room:]
+            flush()
+    flush()
+    return pieces
+
+def chunk_messages(texts: List[str]) -> List[str]:
+    """Join replies in order into messages of at most DISCORD_MESSAGE_MAX characters"""
+    chunks = []
+    current = ""
+    for text in texts:
+        for piece in split_long_message(text):
+            if not current:
+                current = piece
+            elif len(current) + 1 + len(piece) <= DISCORD_MESSAGE_MAX:
+                current = f"{current}\n{piece}"
+            else:
+                chunks.append(current)
+                current = piece
+    if current:
+        chunks.append(current)
+    return chunks
 
 # Discord bot setup
 intents = discord.Intents.default()
@@ -270,197 +454,76 @@ async def on_ready():
             lambda msg, ident: process_rcon_message(bot, rcon_listener, msg, ident)
         ))
 
-def parse_player_command(content: str, command_length: int) -> tuple[str, str]:
-    """Parse player command with or without quotes"""
-    command_content = content[command_length:].strip()
+def split_command(text: str, max_tokens: int) -> List[str]:
+    """Split text on whitespace into at most max_tokens tokens, "double quotes" keep words together"""
+    tokens = []
+    current = []
+    in_token = False
+    in_quotes = False
+    
+    for char in text:
+        if char == '"':
+            # Quotes only group, they are not part of the token ("" is an empty token)
+            in_quotes = not in_quotes
+            in_token = True
+        elif char.isspace() and not in_quotes:
+            if in_token:
+                tokens.append(''.join(current))
+                if len(tokens) == max_tokens:
+                    return tokens
+                current = []
+                in_token = False
+        else:
+            current.append(char)
+            in_token = True
+    
+    # An unclosed quote runs to the end of the text
+    if in_token:
+        tokens.append(''.join(current))
+    return tokens
+
+def parse_player_command(command_content: str) -> tuple[str, str]:
+    """Parse player command arguments with or without quotes"""
     
     if not command_content:
         return "", command_content
     
-    # Try to parse with quotes first
-    import shlex
-    try:
-        parts = shlex.split(command_content)
-        if len(parts) >= 1:
-            player_name = parts[0]
-            return player_name, command_content
-    except:
-        pass
-    
-    # If no quotes or parsing failed, take first word as player name
-    parts = command_content.split(maxsplit=1)
-    if len(parts) >= 1:
-        player_name = parts[0]
-        return player_name, command_content
+    parts = split_command(command_content, 1)
+    if parts:
+        return parts[0], command_content
     
     return "", command_content
 
-def parse_ban_command(content: str, command_length: int) -> tuple[str, str, int]:
-    """Parse ban command: banid player_name "reason" time"""
-    ban_content = content[command_length:].strip()
+def parse_ban_command(ban_content: str) -> tuple[str, str, int]:
+    """Parse ban command arguments: player_name "reason" time"""
     
     if not ban_content:
         return "", "", 0
     
-    import shlex
-    try:
-        # Try to parse with shlex (handles quotes)
-        parts = shlex.split(ban_content)
-        
-        if len(parts) >= 3:
-            # Format: player_name "reason" time
-            player_name = parts[0]
-            reason = parts[1]
-            
-            try:
-                time_seconds = int(parts[2])
-                return player_name, reason, time_seconds
-            except ValueError:
-                return "", "", 0
-        elif len(parts) == 2:
-            # Could be: player_name time (no reason)
-            player_name = parts[0]
-            try:
-                time_seconds = int(parts[1])
-                return player_name, "", time_seconds
-            except ValueError:
-                return "", "", 0
-    except:
-        pass
-    
-    # Try simple parsing if shlex fails
-    parts = ban_content.split(maxsplit=2)
-    if len(parts) >= 3:
-        # Check if middle part is quoted
+    parts = split_command(ban_content, 3)
+    
+    if len(parts) == 3:
+        # Format: player_name "reason" time
         player_name = parts[0]
-        if parts[1].startswith('"') and parts[2].isdigit():
-            reason = parts[1].strip('"')
+        reason = parts[1]
+        
+        try:
             time_seconds = int(parts[2])
             return player_name, reason, time_seconds
+        except ValueError:
+            return "", "", 0
+    elif len(parts) == 2:
+        # Could be: player_name time (no reason)
+        player_name = parts[0]
+        try:
+            time_seconds = int(parts[1])
+            return player_name, "", time_seconds
+        except ValueError:
+            return "", "", 0
     
     return "", "", 0
 
-@bot.event
-async def on_message(message):
-    if message.author == bot.user:
-        return
-    
-    if message.channel.id != MODS_CHANNEL_ID:
-        return
-    
-    print(f"Received command in MODS channel: {message.content}")
-    
-    if message.content.startswith('!'):
-        content = message.content[1:].strip()
-        print(f"Processing command: {content}")
-        
-        if content == 'banlist':
-            await rcon_listener.send_command('banlist', "banlist", message.channel)
-            
-        elif content == 'players':
-            await rcon_listener.send_command('players', "players", message.channel)
-            
-        elif content.startswith('teleportpos'):
-            # Parse coordinates and player name
-            teleport_content = content[11:].strip()
-            
-            # Split by spaces, coordinates are first, player name is the rest
-            parts = teleport_content.split(maxsplit=1)
-            if len(parts) == 2:
-                coordinates = parts[0].strip()
-                player_name = parts[1].strip()
-                
-                # Validate coordinates format
-                coord_pattern = r'^-?\d+(\.\d+)?,-?\d+(\.\d+)?,-?\d+(\.\d+)?$'
-                if not re.match(coord_pattern, coordinates):
-                    await message.channel.send("❌ Error: Invalid coordinates format! Use: x,y,z")
-                    return
-                
-                # Send command with quotes around player name (for spaces in name)
-                rcon_command = f'teleportpos {coordinates} "{player_name}"'
-                await rcon_listener.send_command(rcon_command, "teleportpos", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!teleportpos x,y,z player_name`\nExample: `!teleportpos 100,50,200 Atomic_Acid69`")
-            
-        elif content.startswith('printpos'):
-            player_name, _ = parse_player_command(content, 8)
-            
-            if player_name:
-                rcon_command = f'printpos "{player_name}"'
-                await rcon_listener.send_command(rcon_command, "printpos", message.channel, rcon_command)
-            else:
-                await message.channel.send("❌ Usage: `!printpos player_name`")
-            
-        elif content.startswith('mutevoice'):
-            player_name, _ = parse_player_command(content, 9)
-            
-            if player_name:
-                rcon_command = f'mutevoice {player_name}'
-                await rcon_listener.send_command(rcon_command, "mutevoice", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!mutevoice player_name`")
-            
-        elif content.startswith('unmutevoice'):
-            player_name, _ = parse_player_command(content, 11)
-            
-            if player_name:
-                rcon_command = f'unmutevoice {player_name}'
-                await rcon_listener.send_command(rcon_command, "unmutevoice", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!unmutevoice player_name`")
-            
-        elif content.startswith('mutechat'):
-            player_name, _ = parse_player_command(content, 8)
-            
-            if player_name:
-                rcon_command = f'mutechat {player_name}'
-                await rcon_listener.send_command(rcon_command, "mutechat", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!mutechat player_name`")
-            
-        elif content.startswith('unmutechat'):
-            player_name, _ = parse_player_command(content, 10)
-            
-            if player_name:
-                rcon_command = f'unmutechat {player_name}'
-                await rcon_listener.send_command(rcon_command, "unmutechat", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!unmutechat player_name`")
-        
-        elif content.startswith('kick'):
-            player_name, _ = parse_player_command(content, 4)
-            
-            if player_name:
-                rcon_command = f'kick {player_name}'
-                await rcon_listener.send_command(rcon_command, "kick", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!kick player_name`")
-        
-        elif content.startswith('banid'):
-            player_name, reason, time_seconds = parse_ban_command(content, 5)
-            
-            if player_name and time_seconds >= 0:
-                # Build RCON command
-                if reason:
-                    rcon_command = f'banid {player_name} "{reason}" {time_seconds}'
-                else:
-                    rcon_command = f'banid {player_name} {time_seconds}'
-                
-                await rcon_listener.send_command(rcon_command, "banid", message.channel, rcon_command)
-            else:
-                await message.channel.send("❌ Usage: `!banid player_name \"reason\" time_in_seconds`\nExamples:\n• `!banid player_name \"being toxic\" 300`\n• `!banid player_name 0` (permanent)\n• `!banid Atomic_me 600` (10 minutes)")
-        
-        elif content.startswith('unban'):
-            player_name, _ = parse_player_command(content, 5)
-            
-            if player_name:
-                rcon_command = f'unban {player_name}'
-                await rcon_listener.send_command(rcon_command, "unban", message.channel)
-            else:
-                await message.channel.send("❌ Usage: `!unban player_id`")
-        
-        elif content == 'help':
-            help_text = """
+_HELP_TEXT = """
 **👥 Player Commands:**
 • `!players` - List all online players
 • `!printpos player_name` - Get player's position
@@ -485,10 +548,138 @@ async def on_message(message):
 **📋 Other Commands:**
 • `!help` - Show this help
 """
-            await message.channel.send(help_text)
+
+async def send_player_command(message, args: str, command: str, usage: str):
+    """Send `command player_name` for commands that only take a player"""
+    player_name, _ = parse_player_command(args)
+    
+    if player_name:
+        rcon_command = f'{command} {player_name}'
+        await reply_to_command(message, rcon_command, command)
+    else:
+        await message.channel.send(usage)
+
+async def handle_banlist(message, args: str):
+    """!banlist - list banned players"""
+    await reply_to_command(message, 'banlist', "banlist")
+
+async def handle_players(message, args: str):
+    """!players - list online players"""
+    await reply_to_command(message, 'players', "players")
+
+async def handle_teleportpos(message, args: str):
+    """!teleportpos x,y,z player_name - teleport a player"""
+    # Split by spaces, coordinates are first, player name is the rest
+    parts = args.split(maxsplit=1)
+    if len(parts) == 2:
+        coordinates = parts[0].strip()
+        player_name = parts[1].strip()
+        
+        # Validate coordinates format
+        if not _COORD_VALIDATE_RE.match(coordinates):
+            await message.channel.send("❌ Error: Invalid coordinates format! Use: x,y,z")
+            return
+        
+        # Send command with quotes around player name (for spaces in name)
+        rcon_command = f'teleportpos {coordinates} "{player_name}"'
+        await reply_to_command(message, rcon_command, "teleportpos")
+    else:
+        await message.channel.send("❌ Usage: `!teleportpos x,y,z player_name`\nExample: `!teleportpos 100,50,200 Atomic_Acid69`")
+
+async def handle_printpos(message, args: str):
+    """!printpos player_name - get a player's position"""
+    player_name, _ = parse_player_command(args)
+    
+    if player_name:
+        rcon_command = f'printpos "{player_name}"'
+        await reply_to_command(message, rcon_command, "printpos")
+    else:
+        await message.channel.send("❌ Usage: `!printpos player_name`")
+
+async def handle_mutevoice(message, args: str):
+    """!mutevoice player - mute voice chat"""
+    await send_player_command(message, args, 'mutevoice', "❌ Usage: `!mutevoice player_name`")
+
+async def handle_unmutevoice(message, args: str):
+    """!unmutevoice player - unmute voice chat"""
+    await send_player_command(message, args, 'unmutevoice', "❌ Usage: `!unmutevoice player_name`")
+
+async def handle_mutechat(message, args: str):
+    """!mutechat player - mute text chat"""
+    await send_player_command(message, args, 'mutechat', "❌ Usage: `!mutechat player_name`")
+
+async def handle_unmutechat(message, args: str):
+    """!unmutechat player - unmute text chat"""
+    await send_player_command(message, args, 'unmutechat', "❌ Usage: `!unmutechat player_name`")
+
+async def handle_kick(message, args: str):
+    """!kick player - kick a player"""
+    await send_player_command(message, args, 'kick', "❌ Usage: `!kick player_name`")
+
+async def handle_banid(message, args: str):
+    """!banid player_name "reason" time_in_seconds - ban a player"""
+    player_name, reason, time_seconds = parse_ban_command(args)
+    
+    if player_name and time_seconds >= 0:
+        # Build RCON command
+        if reason:
+            rcon_command = f'banid {player_name} "{reason}" {time_seconds}'
+        else:
+            rcon_command = f'banid {player_name} {time_seconds}'
+        
+        await reply_to_command(message, rcon_command, "banid")
+    else:
+        await message.channel.send("❌ Usage: `!banid player_name \"reason\" time_in_seconds`\nExamples:\n• `!banid player_name \"being toxic\" 300`\n• `!banid player_name 0` (permanent)\n• `!banid Atomic_me 600` (10 minutes)")
+
+async def handle_unban(message, args: str):
+    """!unban player_id - unban a player"""
+    await send_player_command(message, args, 'unban', "❌ Usage: `!unban player_id`")
+
+async def handle_help(message, args: str):
+    """!help - show available commands"""
+    await message.channel.send(_HELP_TEXT)
+
+# Command name -> handler, looked up once per message instead of a startswith chain
+COMMANDS = {
+    'banlist': handle_banlist,
+    'players': handle_players,
+    'teleportpos': handle_teleportpos,
+    'printpos': handle_printpos,
+    'mutevoice': handle_mutevoice,
+    'unmutevoice': handle_unmutevoice,
+    'mutechat': handle_mutechat,
+    'unmutechat': handle_unmutechat,
+    'kick': handle_kick,
+    'banid': handle_banid,
+    'unban': handle_unban,
+    'help': handle_help,
+}
+
+@bot.event
+async def on_message(message):
+    if message.author == bot.user:
+        return
+    
+    if message.channel.id != MODS_CHANNEL_ID:
+        return
+    
+    print(f"Received command in MODS channel: {message.content}")
+    
+    if message.content.startswith('!'):
+        content = message.content[1:].strip()
+        print(f"Processing command: {content}")
+        # The command name ends at any whitespace (space, tab, newline)
+        parts = content.split(maxsplit=1)
+        cmd = parts[0] if parts else ''
+        args = parts[1] if len(parts) > 1 else ''
         
+        handler = COMMANDS.get(cmd)
+        if handler:
+            await handler(message, args.strip())
         else:
             await message.channel.send(f"❌ Unknown command: `{content}`")
 
 # Run the bot
-bot.run(TOKEN)
+if uvloop:
+    uvloop.install()
+bot.run(TOKEN, log_handler=None)  # logging is already configured above
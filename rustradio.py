@@ -5,6 +5,15 @@ from discord.ext import commands
 from dotenv import load_dotenv
 import logging
 import time
+import random
+import signal
+from typing import Dict
+
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -13,20 +22,41 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # Bot setup
-intents = discord.Intents.default()
+# Only the events this bot uses: guilds, voice states and messages for the ! commands
+intents = discord.Intents.none()
+intents.guilds = True
 intents.voice_states = True
+intents.guild_messages = True
+
+# Only cache members while they are in voice, that is all the listener count needs
+member_cache_flags = discord.MemberCacheFlags.none()
+member_cache_flags.voice = True
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+bot = commands.Bot(command_prefix='!', intents=intents,
+                   chunk_guilds_at_startup=False, member_cache_flags=member_cache_flags)
 
 # Channel configuration
-RUST_CHANNEL_ID = os.getenv('RUST_CHANNEL_ID')
+RUST_CHANNEL_ID = int(os.getenv('RUST_CHANNEL_ID') or 0)  # 0 when not configured
 RADIO_STREAM_URL = "http://www.rustedak.com:8024/stream.mp3"
 
-# Track current voice client and retry state
-voice_client = None
+# FFmpeg options for streaming
+FFMPEG_OPTIONS = {
+    'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
+    'options': '-vn -b:a 128k'
+}
+
+# Track the voice client of each guild (by guild ID) and retry state
+voice_clients: Dict[int, discord.VoiceClient] = {}
 connection_attempts = 0
 MAX_RETRIES = 5
-RETRY_DELAY = 5  # seconds
+RETRY_DELAY = 5  # seconds, doubled after each failed attempt
+RETRY_DELAY_MAX = 30  # seconds
+
+# Seconds to wait after a join so a burst of joins triggers a single connect
+JOIN_DEBOUNCE = 0.5
+# Per guild: debounced join check waiting to fire, and the connect task it started
+_pending_join_checks: Dict[int, asyncio.TimerHandle] = {}
+_join_tasks: Dict[int, asyncio.Task] = {}
 
 @bot.event
 async def on_ready():
@@ -39,84 +69,161 @@ async def on_ready():
         name="Rust Radio"
     ))
 
-async def safe_connect(channel, retry_count=0):
+def retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter so retries don't all land at once"""
+    return min(RETRY_DELAY * 2 ** attempt, RETRY_DELAY_MAX) + random.uniform(0, 1)
+
+async def safe_connect(channel):
     """Safely connect to a voice channel with retry logic"""
-    global voice_client, connection_attempts
-    
-    if retry_count >= MAX_RETRIES:
-        logger.error(f"❌ Failed to connect after {MAX_RETRIES} attempts")
-        return None
+    global connection_attempts
     
-    try:
-        logger.info(f"🔗 Attempting to connect to {channel.name} (attempt {retry_count + 1}/{MAX_RETRIES})")
-        
-        # Try to connect
-        vc = await channel.connect(timeout=10.0, reconnect=False)
-        
-        # Reset connection attempts on success
-        connection_attempts = 0
-        
-        logger.info(f"✅ Successfully connected to {channel.name}")
-        return vc
-        
-    except asyncio.TimeoutError:
-        logger.warning(f"⚠️ Connection timeout to {channel.name}, retrying...")
-        await asyncio.sleep(RETRY_DELAY)
-        return await safe_connect(channel, retry_count + 1)
-        
-    except discord.errors.ClientException as e:
-        if "Already connected" in str(e):
+    for attempt in range(MAX_RETRIES):
+        # Reuse an existing connection instead of letting connect() raise
+        existing = channel.guild.voice_client
+        if existing and existing.is_connected():
             logger.info("ℹ️ Already connected to a voice channel")
-            return voice_client
-        else:
-            logger.error(f"❌ Client error: {e}")
-            await asyncio.sleep(RETRY_DELAY)
-            return await safe_connect(channel, retry_count + 1)
+            return existing
+        
+        try:
+            logger.info("🔗 Attempting to connect to %s (attempt %s/%s)", channel.name, attempt + 1, MAX_RETRIES)
             
-    except Exception as e:
-        logger.error(f"❌ Connection error: {e}")
-        await asyncio.sleep(RETRY_DELAY)
-        return await safe_connect(channel, retry_count + 1)
+            # Try to connect
+            vc = await channel.connect(timeout=10.0, reconnect=False)
+            
+            # Reset connection attempts on success
+            connection_attempts = 0
+            
+            logger.info("✅ Successfully connected to %s", channel.name)
+            return vc
+            
+        except asyncio.TimeoutError:
+            logger.warning("⚠️ Connection timeout to %s, retrying...", channel.name)
+            
+        except discord.errors.ClientException as e:
+            logger.error("❌ Client error: %s", e)
+                
+        except Exception as e:
+            logger.error("❌ Connection error: %s", e)
+        
+        if attempt + 1 < MAX_RETRIES:
+            await asyncio.sleep(retry_delay(attempt))
+    
+    logger.error("❌ Failed to connect after %s attempts", MAX_RETRIES)
+    return None
 
-async def safe_play_radio(vc, retry_count=0):
+# An ffmpeg source that was started but never handed to the voice client
+_cached_source = None
+
+def get_radio_source():
+    """Reuse the unplayed ffmpeg source if its process is still running, otherwise start one"""
+    global _cached_source
+    
+    if _cached_source is not None:
+        process = getattr(_cached_source, '_process', None)
+        if process and process.poll() is None:
+            return _cached_source
+        # ffmpeg exited, reap it before starting a new one
+        _cached_source.cleanup()
+    
+    _cached_source = discord.FFmpegPCMAudio(RADIO_STREAM_URL, **FFMPEG_OPTIONS)
+    return _cached_source
+
+async def safe_play_radio(vc):
     """Safely play radio with retry logic"""
-    if retry_count >= MAX_RETRIES:
-        logger.error(f"❌ Failed to play radio after {MAX_RETRIES} attempts")
-        return False
+    global _cached_source
     
-    try:
-        # FFmpeg options for streaming
-        ffmpeg_options = {
-            'before_options': '-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5',
-            'options': '-vn -b:a 128k'
-        }
-        
-        logger.info(f"🎵 Attempting to play radio stream (attempt {retry_count + 1}/{MAX_RETRIES})")
-        
-        source = discord.FFmpegPCMAudio(RADIO_STREAM_URL, **ffmpeg_options)
-        vc.play(source)
-        
-        # Wait to confirm it's playing
-        await asyncio.sleep(3)
-        
-        if vc.is_playing():
-            logger.info("✅ Radio is now playing")
-            return True
-        else:
+    for attempt in range(MAX_RETRIES):
+        try:
+            logger.info("🎵 Attempting to play radio stream (attempt %s/%s)", attempt + 1, MAX_RETRIES)
+            
+            source = get_radio_source()
+            vc.play(source)
+            # The voice client owns it now and stops ffmpeg when playback ends
+            _cached_source = None
+            
+            # Wait to confirm it's playing
+            await asyncio.sleep(3)
+            
+            if vc.is_playing():
+                logger.info("✅ Radio is now playing")
+                return True
+            
             logger.warning("⚠️ Radio not playing, retrying...")
             vc.stop()
-            await asyncio.sleep(RETRY_DELAY)
-            return await safe_play_radio(vc, retry_count + 1)
+                
+        except Exception as e:
+            logger.error("❌ Error playing radio: %s", e)
+        
+        if attempt + 1 < MAX_RETRIES:
+            await asyncio.sleep(retry_delay(attempt))
+    
+    logger.error("❌ Failed to play radio after %s attempts", MAX_RETRIES)
+    return False
+
+def schedule_join_check(channel):
+    """Handle a burst of joins with one connect_and_play call once it settles"""
+    guild_id = channel.guild.id
+    if guild_id not in _pending_join_checks:
+        loop = asyncio.get_running_loop()
+        _pending_join_checks[guild_id] = loop.call_later(JOIN_DEBOUNCE, _start_join_check, channel)
+
+def _start_join_check(channel):
+    """Timer callback, starts connect_and_play unless one is already running"""
+    guild_id = channel.guild.id
+    del _pending_join_checks[guild_id]
+    # A connect still in progress will play for the new listeners as well
+    task = _join_tasks.get(guild_id)
+    if task is None or task.done():
+        _join_tasks[guild_id] = asyncio.create_task(connect_and_play(channel))
+
+async def connect_and_play(channel):
+    """Connect to the channel and start the radio, or restart it if it stopped"""
+    guild_id = channel.guild.id
+    
+    # Everyone may have left again while the check was pending
+    if not any(not m.bot for m in channel.members):
+        return
+    
+    vc = voice_clients.get(guild_id)
+    
+    # Check if we need to connect
+    if not vc or not vc.is_connected():
+        try:
+            # Clear previous voice client if exists but not connected
+            if vc:
+                voice_clients.pop(guild_id, None)
+                try:
+                    await vc.disconnect(force=True)
+                except:
+                    pass
             
-    except Exception as e:
-        logger.error(f"❌ Error playing radio: {e}")
-        await asyncio.sleep(RETRY_DELAY)
-        return await safe_play_radio(vc, retry_count + 1)
+            # Try to connect
+            vc = await safe_connect(channel)
+            
+            if vc and vc.is_connected():
+                voice_clients[guild_id] = vc
+                # Try to play radio
+                success = await safe_play_radio(vc)
+                if success:
+                    logger.info("▶️ Playing Darkwave Radio in %s", channel.name)
+                else:
+                    logger.error("❌ Failed to start radio, disconnecting...")
+                    voice_clients.pop(guild_id, None)
+                    await safe_disconnect(vc)
+            
+        except Exception as e:
+            logger.error("❌ Failed to handle join: %s", e)
+            voice_clients.pop(guild_id, None)
+    else:
+        # Already connected, check if we should restart radio
+        if not vc.is_playing():
+            logger.info("🔄 Radio stopped, restarting...")
+            success = await safe_play_radio(vc)
+            if not success:
+                logger.error("❌ Failed to restart radio")
 
 @bot.event
 async def on_voice_state_update(member, before, after):
-    global voice_client, connection_attempts
-    
     # Ignore bot's own voice state changes
     if member.bot:
         return
@@ -125,59 +232,27 @@ async def on_voice_state_update(member, before, after):
     if not RUST_CHANNEL_ID:
         return
     
-    target_channel_id = int(RUST_CHANNEL_ID)
+    # Mute/deafen/stream toggles don't change the channel, nothing to do
+    if before.channel == after.channel:
+        return
     
     # User joined the target channel
-    if after.channel and after.channel.id == target_channel_id:
-        logger.info(f"👤 {member.name} joined {after.channel.name}")
+    if after.channel and after.channel.id == RUST_CHANNEL_ID:
+        logger.info("👤 %s joined %s", member.name, after.channel.name)
         
-        # Check if we need to connect
-        if not voice_client or not voice_client.is_connected():
-            try:
-                # Clear previous voice client if exists but not connected
-                if voice_client:
-                    try:
-                        await voice_client.disconnect(force=True)
-                    except:
-                        pass
-                    voice_client = None
-                
-                # Try to connect
-                voice_client = await safe_connect(after.channel)
-                
-                if voice_client and voice_client.is_connected():
-                    # Try to play radio
-                    success = await safe_play_radio(voice_client)
-                    if success:
-                        logger.info(f"▶️ Playing Darkwave Radio in {after.channel.name}")
-                    else:
-                        logger.error("❌ Failed to start radio, disconnecting...")
-                        await safe_disconnect(voice_client)
-                        voice_client = None
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to handle join: {e}")
-                voice_client = None
-        else:
-            # Already connected, check if we should restart radio
-            if voice_client and voice_client.is_connected():
-                if not voice_client.is_playing():
-                    logger.info("🔄 Radio stopped, restarting...")
-                    success = await safe_play_radio(voice_client)
-                    if not success:
-                        logger.error("❌ Failed to restart radio")
+        schedule_join_check(after.channel)
     
     # User left the target channel
-    if before.channel and before.channel.id == target_channel_id:
-        logger.info(f"👤 {member.name} left {before.channel.name}")
+    if before.channel and before.channel.id == RUST_CHANNEL_ID:
+        logger.info("👤 %s left %s", member.name, before.channel.name)
         
-        if voice_client and voice_client.is_connected():
+        vc = voice_clients.get(member.guild.id)
+        if vc and vc.is_connected():
             # Check if anyone is left (excluding bots)
-            human_members = [m for m in before.channel.members if not m.bot]
-            if len(human_members) == 0:
+            if not any(not m.bot for m in before.channel.members):
                 logger.info("📭 No humans left in channel, disconnecting...")
-                await safe_disconnect(voice_client)
-                voice_client = None
+                del voice_clients[member.guild.id]
+                await safe_disconnect(vc)
 
 async def safe_disconnect(vc):
     """Safely disconnect from voice channel"""
@@ -192,7 +267,7 @@ async def safe_disconnect(vc):
         logger.info("✅ Disconnected from voice channel")
         
     except Exception as e:
-        logger.error(f"❌ Error during disconnect: {e}")
+        logger.error("❌ Error during disconnect: %s", e)
         try:
             await vc.disconnect(force=True)
         except:
@@ -200,43 +275,39 @@ async def safe_disconnect(vc):
 
 @bot.event
 async def on_error(event, *args, **kwargs):
-    logger.error(f"⚠️ Error in event {event}: {args} {kwargs}")
+    logger.error("⚠️ Error in event %s: %s %s", event, args, kwargs)
 
 @bot.event
 async def on_command_error(ctx, error):
-    logger.error(f"⚠️ Command error: {error}")
+    logger.error("⚠️ Command error: %s", error)
 
 # Command to manually check status
 @bot.command(name='radiostatus')
 async def radio_status(ctx):
     """Check the radio bot status"""
-    global voice_client
+    vc = voice_clients.get(ctx.guild.id) if ctx.guild else None
     
-    status = []
-    status.append(f"**📻 Rust Radio Bot Status**")
-    status.append(f"Target Channel: <#{RUST_CHANNEL_ID}>")
-    
-    if voice_client and voice_client.is_connected():
-        status.append(f"✅ **Connected** to {voice_client.channel.name}")
-        status.append(f"🎵 **Playing**: {'Yes' if voice_client.is_playing() else 'No'}")
-        status.append(f"👥 **Listeners**: {len([m for m in voice_client.channel.members if not m.bot])}")
+    if vc and vc.is_connected():
+        body = (f"✅ **Connected** to {vc.channel.name}\n"
+                f"🎵 **Playing**: {'Yes' if vc.is_playing() else 'No'}\n"
+                f"👥 **Listeners**: {sum(1 for m in vc.channel.members if not m.bot)}")
     else:
-        status.append("❌ **Not connected**")
+        body = "❌ **Not connected**"
     
-    await ctx.send("\n".join(status))
+    await ctx.send(f"**📻 Rust Radio Bot Status**\nTarget Channel: <#{RUST_CHANNEL_ID}>\n{body}")
 
 # Command to manually restart radio
 @bot.command(name='restartradio')
 @commands.has_permissions(manage_channels=True)
 async def restart_radio(ctx):
     """Manually restart the radio stream (Admin only)"""
-    global voice_client
+    vc = voice_clients.get(ctx.guild.id) if ctx.guild else None
     
-    if voice_client and voice_client.is_connected():
-        if voice_client.is_playing():
-            voice_client.stop()
+    if vc and vc.is_connected():
+        if vc.is_playing():
+            vc.stop()
         
-        success = await safe_play_radio(voice_client)
+        success = await safe_play_radio(vc)
         if success:
             await ctx.send("✅ Radio stream restarted!")
         else:
@@ -244,51 +315,83 @@ async def restart_radio(ctx):
     else:
         await ctx.send("❌ Bot is not connected to a voice channel")
 
+async def shutdown():
+    """Disconnect from voice and close the bot, reaping any unplayed ffmpeg process"""
+    global _cached_source
+    
+    # Don't let a pending join start ffmpeg after we close
+    for handle in _pending_join_checks.values():
+        handle.cancel()
+    _pending_join_checks.clear()
+    if _cached_source is not None:
+        _cached_source.cleanup()
+        _cached_source = None
+    # Disconnects every voice client, which stops their ffmpeg processes too
+    if not bot.is_closed():
+        await bot.close()
+
 # Run the bot with retry logic
 async def main():
     retry_count = 0
     max_bot_retries = 3
     
-    while retry_count < max_bot_retries:
-        try:
-            logger.info(f"🤖 Starting bot (attempt {retry_count + 1}/{max_bot_retries})")
-            
-            if not RUST_CHANNEL_ID:
-                logger.error("❌ ERROR: RUST_CHANNEL_ID not found in .env file!")
-                print("\nAdd to your .env file:")
-                print("DISCORD_TOKEN=your_bot_token_here")
-                print("RUST_CHANNEL_ID=your_channel_id_here")
-                exit(1)
-            
-            token = os.getenv('DISCORD_TOKEN')
-            if not token:
-                logger.error("❌ ERROR: DISCORD_TOKEN not found in .env file!")
-                exit(1)
-            
-            print("\n" + "="*50)
-            print("📻 Rust Radio Bot Starting...")
-            print("✅ Auto-joins when users enter the channel")
-            print("✅ Auto-leaves when everyone leaves")
-            print("✅ Auto-retry on failures")
-            print("✅ Commands: !radiostatus, !restartradio")
-            print("="*50 + "\n")
-            
-            await bot.start(token)
-            
-        except KeyboardInterrupt:
-            logger.info("👋 Bot stopped by user")
-            break
-            
-        except Exception as e:
-            retry_count += 1
-            logger.error(f"❌ Bot crashed: {e}")
-            
-            if retry_count < max_bot_retries:
-                logger.info(f"🔄 Restarting bot in 10 seconds...")
-                await asyncio.sleep(10)
-            else:
-                logger.error(f"❌ Bot failed after {max_bot_retries} attempts")
+    # Close cleanly on SIGTERM; Windows has no loop signal handlers, Ctrl+C still works there
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, lambda: loop.create_task(shutdown()))
+    except NotImplementedError:
+        pass
+    
+    try:
+        while retry_count < max_bot_retries:
+            try:
+                logger.info("🤖 Starting bot (attempt %s/%s)", retry_count + 1, max_bot_retries)
+                
+                if not RUST_CHANNEL_ID:
+                    logger.error("❌ ERROR: RUST_CHANNEL_ID not found in .env file!")
+                    print("\nAdd to your .env file:")
+                    print("DISCORD_TOKEN=your_bot_token_here")
+                    print("RUST_CHANNEL_ID=your_channel_id_here")
+                    exit(1)
+                
+                token = os.getenv('DISCORD_TOKEN')
+                if not token:
+                    logger.error("❌ ERROR: DISCORD_TOKEN not found in .env file!")
+                    exit(1)
+                
+                print("\n" + "="*50)
+                print("📻 Rust Radio Bot Starting...")
+                print("✅ Auto-joins when users enter the channel")
+                print("✅ Auto-leaves when everyone leaves")
+                print("✅ Auto-retry on failures")
+                print("✅ Commands: !radiostatus, !restartradio")
+                print("="*50 + "\n")
+                
+                await bot.start(token)
+                # start() only returns once the bot was closed
                 break
+                
+            except KeyboardInterrupt:
+                logger.info("👋 Bot stopped by user")
+                break
+                
+            except Exception as e:
+                retry_count += 1
+                logger.error("❌ Bot crashed: %s", e)
+                
+                if retry_count < max_bot_retries:
+                    logger.info("🔄 Restarting bot in 10 seconds...")
+                    await asyncio.sleep(10)
+                else:
+                    logger.error("❌ Bot failed after %s attempts", max_bot_retries)
+                    break
+    finally:
+        await shutdown()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.install()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("👋 Bot stopped by user")
@@ -1,11 +1,25 @@
 import discord
 import asyncio
 import os
-import json
+import signal
+import logging
+import orjson
 import websockets
-from typing import Optional, Dict
+from websockets.asyncio.client import connect, ClientConnection
+from collections import deque
+from typing import Optional, List
 from dotenv import load_dotenv
 
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Setup logging (set to DEBUG to see every command and response)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -16,23 +30,36 @@ RCON_PORT = int(os.getenv('RCON_PORT'))
 RCON_PASSWORD = os.getenv('RCON_PASSWORD')
 SERVER_OWNER_CHANNEL_ID = int(os.getenv('SERVER_OWNER_CHANNEL_ID'))
 
+# Response slots, a command waits in slot (ID & RESPONSE_SLOT_MASK); must be a power of two
+RESPONSE_SLOTS = 256
+RESPONSE_SLOT_MASK = RESPONSE_SLOTS - 1
+
+# How many unclaimed server messages (chat, joins, ...) to keep, oldest are dropped first
+UNSOLICITED_MAX = 256
+
 class RawRCONClient:
     """Simple RCON WebSocket client for sending raw commands"""
     
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self.websocket: Optional[ClientConnection] = None
         self.command_counter = 1
         self.is_connected = False
-        self.pending_responses: Dict[int, asyncio.Future] = {}
+        self.unsolicited: deque = deque(maxlen=UNSOLICITED_MAX)  # (identifier, message)
+        # Waiting commands by slot, indexed directly instead of hashing IDs into a dict
+        self._slot_ids: List[int] = [0] * RESPONSE_SLOTS
+        self._slots: List[Optional[asyncio.Future]] = [None] * RESPONSE_SLOTS
         self.receive_task = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # set on connect
     
     async def connect(self) -> bool:
         """Establish connection to server"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # RCON frames are small and local, compression only costs CPU on every recv
+            self.websocket = await connect(self.uri, compression=None, max_size=2**20)
             self.is_connected = True
+            self._loop = asyncio.get_running_loop()
             print("Connected successfully")
             
             # Start receiving messages in background
@@ -46,59 +73,65 @@ class RawRCONClient:
     
     async def _receive_messages(self):
         """Continuously receive messages from server"""
+        websocket = self.websocket
         try:
-            while self.is_connected and self.websocket:
-                try:
-                    response = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-                    await self._process_response(response)
-                except asyncio.TimeoutError:
-                    continue
-                except websockets.exceptions.ConnectionClosed:
-                    print("WebSocket connection closed")
-                    self.is_connected = False
-                    break
+            # Raw bytes: orjson parses them directly, no UTF-8 decode to str first
+            # (async for would yield str). No timeout needed, close() cancels this task
+            while True:
+                response = await websocket.recv(decode=False)
+                await self._process_response(response)
+        except websockets.exceptions.ConnectionClosed:
+            print("WebSocket connection closed")
         except Exception as e:
             print(f"Error in receive_messages: {e}")
+        finally:
             self.is_connected = False
     
-    async def _process_response(self, response: str):
+    async def _process_response(self, response: bytes):
         """Process response from server"""
         try:
-            response_data = json.loads(response)
+            response_data = orjson.loads(response)
             identifier = response_data.get("Identifier", -1)
-            message = response_data.get("Message", "")
-            
-            # Clean up the message
-            if isinstance(message, str):
-                message = message.replace("\u0000", "").strip()
+            # Message is always a string in WebRCON frames
+            message = response_data.get("Message", "").replace("\u0000", "").strip()
             
-            print(f"Received response for ID {identifier}: {repr(message[:100])}")
+            logger.debug("Received response for ID %s: %r", identifier, message[:100])
             
-            # Check if we're waiting for this response
-            if identifier in self.pending_responses:
-                future = self.pending_responses[identifier]
+            # Check if we're waiting for this response (the slot may hold a newer command)
+            slot = identifier & RESPONSE_SLOT_MASK
+            future = self._slots[slot]
+            if future is not None and self._slot_ids[slot] == identifier:
                 if not future.done():
                     future.set_result(message)
-                del self.pending_responses[identifier]
+                self._slots[slot] = None
             else:
-                # Log unexpected responses
-                print(f"Unexpected response for ID {identifier}")
+                # Keep unexpected responses in a bounded buffer
+                logger.debug("Unexpected response for ID %s", identifier)
+                self.unsolicited.append((identifier, message))
                 
-        except json.JSONDecodeError:
-            print(f"Non-JSON response: {repr(response[:100])}")
+        except orjson.JSONDecodeError:
+            logger.debug("Non-JSON response: %r", response[:100])
+        except (TypeError, AttributeError):
+            # e.g. "Message": null, a non-object payload or a non-int Identifier
+            logger.debug("Unexpected frame: %r", response[:100])
     
     async def send_raw_command(self, command: str) -> str:
         """Send raw command to WebSocket RCON server and return response"""
+        current_id = None
         try:
             if not self.is_connected or not self.websocket:
                 if not await self.connect():
                     return "❌ Failed to connect to server"
             
+            # Claim the ID before awaiting so concurrent commands never share one
             current_id = self.command_counter
+            self.command_counter += 1
             
             # Create a future to wait for the response
-            response_future = asyncio.Future()
-            self.pending_responses[current_id] = response_future
+            response_future = self._loop.create_future()
+            slot = current_id & RESPONSE_SLOT_MASK
+            self._slot_ids[slot] = current_id
+            self._slots[slot] = response_future
             
             command_data = {
                 "Message": command,
@@ -107,39 +140,50 @@ class RawRCONClient:
                 "Stacktrace": None
             }
             
-            await self.websocket.send(json.dumps(command_data))
-            print(f"Sent command (ID {current_id}): {command}")
+            # Rust's WebRCON only reads text frames, so send the encoded JSON as str
+            await self.websocket.send(orjson.dumps(command_data).decode())
+            logger.debug("Sent command (ID %s): %s", current_id, command)
             
             # Wait for response with timeout
             try:
                 response = await asyncio.wait_for(response_future, timeout=10.0)
-                self.command_counter += 1
                 return response if response else "✅ Command executed (empty response)"
             except asyncio.TimeoutError:
-                del self.pending_responses[current_id]
-                self.command_counter += 1
+                self._release_slot(current_id)
                 return "⏰ Command timed out - no response received"
             
         except Exception as e:
             print(f"Error sending command: {e}")
-            if current_id in self.pending_responses:
-                del self.pending_responses[current_id]
+            if current_id is not None:
+                self._release_slot(current_id)
             self.is_connected = False
             return f"❌ Error: {str(e)}"
     
+    def _release_slot(self, identifier: int):
+        """Free a command's slot unless a newer command already took it"""
+        slot = identifier & RESPONSE_SLOT_MASK
+        if self._slot_ids[slot] == identifier:
+            self._slots[slot] = None
+    
     async def close(self) -> None:
         """Close the connection"""
         self.is_connected = False
         if self.receive_task:
             self.receive_task.cancel()
+            await asyncio.gather(self.receive_task, return_exceptions=True)
+            self.receive_task = None
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
 
 # Discord bot setup
-intents = discord.Intents.default()
+# Only the events this bot uses: guild messages and their content
+intents = discord.Intents.none()
+intents.guilds = True
+intents.guild_messages = True
 intents.message_content = True
-bot = discord.Client(intents=intents)
+bot = discord.Client(intents=intents, chunk_guilds_at_startup=False,
+                     member_cache_flags=discord.MemberCacheFlags.none())
 
 # Global RCON client
 rcon_client = None
@@ -180,17 +224,43 @@ async def on_message(message):
         
         # Format response for Discord
         if response:
-            # Truncate if too long for Discord
-            if len(response) > 1900:
-                response = response[:1900] + "\n... (truncated)"
+            # Truncate if too long for Discord (slicing a short str returns it as is)
+            clipped = response[:1900]
+            suffix = "\n... (truncated)" if len(response) > 1900 else ""
             
-            # Send response back to Discord
-            if response.startswith("❌") or response.startswith("⏰"):
+            # Send response back to Discord, built in a single format
+            if response.startswith(("❌", "⏰")):
                 # Error message
-                await message.reply(response, mention_author=False)
+                await message.reply(f"{clipped}{suffix}", mention_author=False)
             else:
                 # Normal response in code block
-                await message.reply(f"```\n{response}\n```", mention_author=False)
+                await message.reply(f"```\n{clipped}{suffix}\n```", mention_author=False)
+
+async def shutdown():
+    """Close the RCON connection first, then the Discord client"""
+    if rcon_client:
+        await rcon_client.close()
+    if not bot.is_closed():
+        await bot.close()
+
+async def main():
+    # Close cleanly on SIGTERM; Windows has no loop signal handlers, Ctrl+C still works there
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, lambda: loop.create_task(shutdown()))
+    except NotImplementedError:
+        pass
+    
+    try:
+        async with bot:
+            await bot.start(TOKEN)
+    finally:
+        await shutdown()
 
-# Run the bot
-bot.run(TOKEN)
+# Run the bot (logging is already configured above)
+if uvloop:
+    uvloop.install()
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    print("Bot stopped")
@@ -0,0 +1,15 @@
+import time
+
+# HH:MM:SS of the last second a timestamp was made for, reused until the second changes
+_last_second = None
+_last_second_text = ""
+
+def format_timestamp() -> str:
+    """Current local time as HH:MM:SS.mmm"""
+    global _last_second, _last_second_text
+    now = time.time()
+    second = int(now)
+    if second != _last_second:
+        _last_second = second
+        _last_second_text = time.strftime("%H:%M:%S", time.localtime(second))
+    return f"{_last_second_text}.{int((now - second) * 1000):03d}"
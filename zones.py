@@ -1,12 +1,25 @@
 import discord
 import os
-import json
+import orjson
 import websockets
+from websockets.asyncio.client import connect, ClientConnection
 import asyncio
-from typing import Optional
-from datetime import datetime
+import logging
+import random
+from functools import partial
+from typing import Final, Optional, List, Tuple
 from dotenv import load_dotenv
 
+# uvloop is optional (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Setup logging (set to DEBUG to dump every RCON message)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -15,34 +28,77 @@ TOKEN = os.getenv('DISCORD_TOKEN')
 SERVER_IP = os.getenv('SERVER_IP')
 RCON_PORT = int(os.getenv('RCON_PORT'))
 RCON_PASSWORD = os.getenv('RCON_PASSWORD')
-ZONES_CHANNEL_ID = int(os.getenv('ZONES'))
+ZONES_CHANNEL_ID: Final[int] = int(os.getenv('ZONES'))
+
+# Response slots, a command's reply info lives in slot (ID & RESPONSE_SLOT_MASK); must be a power of two
+RESPONSE_SLOTS = 1024
+RESPONSE_SLOT_MASK = RESPONSE_SLOTS - 1
+
+# First character of a JSON object frame, as text or binary; anything else can't be RCON JSON
+_FRAME_STARTS = ('{', b'{')
+
+# Initial command, constant so it is encoded once (sent as text, Rust's WebRCON ignores binary frames)
+_INIT_FRAME = orjson.dumps({
+    "Message": "",
+    "Identifier": 1,
+    "Type": "Command",
+    "Stacktrace": None
+}).decode()
+
+# Most queued commands the sender writes back to back before yielding
+SEND_BATCH_MAX = 32
+
+# Reconnect delay doubles from the first value up to the cap, plus up to 10% jitter (seconds)
+RECONNECT_BACKOFF_START = 0.1
+RECONNECT_BACKOFF_MAX = 30.0
+
+# Seconds to wait for a command's reply before posting its confirmation without one
+RESPONSE_TIMEOUT = 5.0
+
+# Discord's message length limit
+DISCORD_MESSAGE_MAX = 2000
+
+# Discord replies posted in the background at once, past this the listener waits for one to finish
+REPLIES_IN_FLIGHT_MAX = 8
 
 class RCONListener:
     """RCON WebSocket client that listens to ALL server messages"""
     
     def __init__(self, server_ip: str, rcon_port: int, rcon_password: str):
         self.uri = f"ws://{server_ip}:{rcon_port}/{rcon_password}"
-        self.websocket: Optional[websockets.WebSocketClientProtocol] = None
-        self.command_counter = 1
+        self.websocket: Optional[ClientConnection] = None
+        self.command_counter = 2  # 1 is the init frame's ID
         self.is_connected = False
-        self.pending_responses = {}
+        # Commands waiting for a reply by slot: (command_type, discord_channel, confirmation)
+        self._slot_ids: List[int] = [0] * RESPONSE_SLOTS
+        self._slots: List[Optional[Tuple[str, object, str]]] = [None] * RESPONSE_SLOTS
+        # (frame, future set to whether it was written), drained by _send_forever
+        self._send_queue: asyncio.Queue = asyncio.Queue()
+        self._sender_task: Optional[asyncio.Task] = None
+        self._backoff = RECONNECT_BACKOFF_START
     
     async def connect(self) -> bool:
         """Establish connection to server"""
         try:
             print(f"Connecting to {self.uri}")
-            self.websocket = await websockets.connect(self.uri)
+            # RCON frames are small and local, compression only costs CPU on every recv
+            self.websocket = await connect(
+                self.uri,
+                compression=None,
+                max_size=2**20,
+                write_limit=2**18,
+                ping_interval=20,
+                ping_timeout=20
+            )
             self.is_connected = True
             print("Connected successfully")
             
+            # The sender outlives reconnects, it always writes to the current websocket
+            if self._sender_task is None or self._sender_task.done():
+                self._sender_task = asyncio.create_task(self._send_forever())
+            
             # Send initial command
-            init_data = {
-                "Message": "",
-                "Identifier": 1,
-                "Type": "Command",
-                "Stacktrace": None
-            }
-            await self.websocket.send(json.dumps(init_data))
+            await self.websocket.send(_INIT_FRAME)
             
             return True
         except Exception as e:
@@ -57,60 +113,82 @@ class RCONListener:
                 if not self.is_connected or not self.websocket:
                     print("Not connected, reconnecting...")
                     if not await self.connect():
-                        await asyncio.sleep(5)
+                        await self._wait_backoff()
                         continue
                 
-                raw_response = await self.websocket.recv()
+                # Locals for the per-frame lookups, rebound on every reconnect
+                websocket = self.websocket
+                loads = orjson.loads
                 
-                try:
-                    response_data = json.loads(raw_response)
-                    message = response_data.get("Message", "")
-                    identifier = response_data.get("Identifier", 0)
+                # Iterating ends quietly when the server closes the connection normally
+                async for raw_response in websocket:
+                    self._backoff = RECONNECT_BACKOFF_START
                     
-                    if isinstance(message, str):
-                        message = message.replace("\u0000", "").strip()
+                    # Skip the parser (and its exception) for data that can't be a frame
+                    if raw_response[:1] not in _FRAME_STARTS:
+                        logger.info("Non-JSON message: %r", raw_response)
+                        continue
                     
-                    # Debug output
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                    print(f"\n{'='*60}")
-                    print(f"Message #{identifier} | {timestamp}")
-                    print(f"{'='*60}")
-                    if message:
-                        print(f"Message content: {repr(message)}")
+                    try:
+                        response_data = loads(raw_response)
+                        # Message is a string in WebRCON frames, anything else is skipped below
+                        message = response_data.get("Message", "")
+                        identifier = response_data.get("Identifier", 0)
+                        
+                        # Most frames have no NUL, only rebuild the string when one is there
+                        if "\x00" in message:
+                            message = message.replace("\x00", "")
+                        message = message.strip()
+                    except orjson.JSONDecodeError:
+                        logger.info("Non-JSON message: %r", raw_response)
+                        continue
+                    except (TypeError, AttributeError):
+                        # e.g. "Message": null
+                        logger.info("Unexpected frame: %r", raw_response)
+                        continue
+                    
+                    # Debug output (skipped entirely unless DEBUG logging is on)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Message #%s", identifier)
+                        if message:
+                            logger.debug("Message content: %r", message)
                     
                     if process_callback:
                         await process_callback(message, identifier)
-                        
-                except json.JSONDecodeError:
-                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                    print(f"\n{'='*60}")
-                    print(f"Non-JSON Message | {timestamp}")
-                    print(f"{'='*60}")
-                    print(f"Raw bytes: {repr(raw_response)}")
+                
+                print("Connection closed, reconnecting...")
+                self.is_connected = False
+                await self._wait_backoff()
                     
             except websockets.exceptions.ConnectionClosed:
                 print("Connection closed, reconnecting...")
                 self.is_connected = False
-                await asyncio.sleep(5)
+                await self._wait_backoff()
             except Exception as e:
                 print(f"Error listening: {e}")
-                await asyncio.sleep(1)
+                await self._wait_backoff()
+    
+    async def _wait_backoff(self):
+        """Sleep before the next attempt, backing off further each time it fails again"""
+        await asyncio.sleep(self._backoff * (1 + random.random() * 0.1))
+        self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
     
     async def send_command(self, command: str, command_type: str = "", discord_channel = None, discord_message: str = "") -> bool:
-        """Send command to WebSocket RCON server"""
+        """Queue a command for the sender and wait until it was written to the RCON server,
+        the reply is posted to discord_channel after discord_message if given"""
         try:
             if not self.is_connected or not self.websocket:
                 if not await self.connect():
                     return False
             
+            # Claim the ID before awaiting so concurrent commands never share one
             current_id = self.command_counter
+            self.command_counter += 1
             
             if discord_channel:
-                self.pending_responses[current_id] = {
-                    "type": command_type,
-                    "channel": discord_channel,
-                    "message": discord_message or command
-                }
+                slot = current_id & RESPONSE_SLOT_MASK
+                self._slot_ids[slot] = current_id
+                self._slots[slot] = (command_type, discord_channel, discord_message)
             
             command_data = {
                 "Message": command,
@@ -119,9 +197,19 @@ class RCONListener:
                 "Stacktrace": None
             }
             
-            await self.websocket.send(json.dumps(command_data))
-            print(f"Sent command (ID {current_id}): {command}")
-            self.command_counter += 1
+            # Rust's WebRCON only reads text frames, so send the encoded JSON as str
+            written = asyncio.get_running_loop().create_future()
+            self._send_queue.put_nowait((orjson.dumps(command_data).decode(), written))
+            
+            if not await written:
+                self.take_pending(current_id)
+                return False
+            
+            logger.debug("Sent command (ID %s): %s", current_id, command)
+            
+            # Still confirm the command if its reply never comes (e.g. the connection drops)
+            if discord_channel and discord_message:
+                asyncio.get_running_loop().call_later(RESPONSE_TIMEOUT, self._reply_timed_out, current_id)
             return True
             
         except Exception as e:
@@ -129,38 +217,119 @@ class RCONListener:
             self.is_connected = False
             return False
     
+    async def _send_forever(self):
+        """Write queued frames, taking everything queued so far (up to SEND_BATCH_MAX) in one go"""
+        queue = self._send_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < SEND_BATCH_MAX:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            # WebRCON takes one command per frame, so the batch is written back to back
+            sent = 0
+            try:
+                for payload, _ in batch:
+                    await self.websocket.send(payload)
+                    sent += 1
+            except Exception as e:
+                print(f"Error sending to RCON: {e}")
+                self.is_connected = False
+            finally:
+                # Tell each caller whether its frame went out (also when cancelled by close)
+                for index, (_, written) in enumerate(batch):
+                    if not written.done():
+                        written.set_result(index < sent)
+    
+    def _reply_timed_out(self, identifier: int):
+        """Timer callback, posts the confirmation of a command the server didn't answer"""
+        command_info = self.take_pending(identifier)
+        if command_info is not None:
+            _, discord_channel, confirmation = command_info
+            # Kept in _reply_tasks so the reply isn't garbage collected before it is sent
+            task = asyncio.create_task(_send_reply(discord_channel, (f"{confirmation}\n⏰ No response from the server",)))
+            _reply_tasks.add(task)
+            task.add_done_callback(_reply_tasks.discard)
+    
+    def take_pending(self, identifier: int) -> Optional[Tuple[str, object, str]]:
+        """Remove and return the reply info for a command (None if it isn't waiting or a newer command took the slot)"""
+        slot = identifier & RESPONSE_SLOT_MASK
+        if self._slot_ids[slot] != identifier:
+            return None
+        info = self._slots[slot]
+        self._slots[slot] = None
+        return info
+    
     async def close(self) -> None:
         """Close the connection"""
+        if self._sender_task:
+            self._sender_task.cancel()
+            await asyncio.gather(self._sender_task, return_exceptions=True)
+            self._sender_task = None
+        # Commands still queued will never be written
+        while not self._send_queue.empty():
+            _, written = self._send_queue.get_nowait()
+            if not written.done():
+                written.set_result(False)
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
             self.is_connected = False
 
+# Background reply tasks, referenced here so they aren't garbage collected while running
+_reply_tasks: set = set()
+
+async def _send_reply(channel, texts):
+    """Post reply messages in order, logging instead of raising if Discord rejects one"""
+    try:
+        for text in texts:
+            await channel.send(text)
+    except Exception as e:
+        print(f"Error sending response: {e}")
+
+async def post_reply(channel, *texts: str):
+    """Post reply messages in the background so the RCON listener can keep reading frames"""
+    # Backpressure: when Discord is slow or rate limiting, wait for a slot
+    while len(_reply_tasks) >= REPLIES_IN_FLIGHT_MAX:
+        await asyncio.wait(_reply_tasks, return_when=asyncio.FIRST_COMPLETED)
+    
+    task = asyncio.create_task(_send_reply(channel, texts))
+    _reply_tasks.add(task)
+    task.add_done_callback(_reply_tasks.discard)
+
 async def process_rcon_message(bot, rcon_listener: RCONListener, message: str, identifier: int):
     """Process incoming RCON message"""
+    # Check if this is a response to a command we sent
+    command_info = rcon_listener.take_pending(identifier)
+    if command_info is None:
+        return
+    command_type, discord_channel, confirmation = command_info
+    
     if not message:
+        # Nothing came back, the confirmation is all there is to post
+        if confirmation:
+            await post_reply(discord_channel, confirmation)
         return
     
-    # Check if this is a response to a command we sent
-    if identifier in rcon_listener.pending_responses:
-        command_info = rcon_listener.pending_responses[identifier]
-        command_type = command_info.get("type", "")
-        discord_channel = command_info.get("channel")
-        
-        if message and discord_channel:
-            try:
-                await discord_channel.send(f"🗺️ **Zone Command Response**:\n```\n{message}\n```")
-            except Exception as e:
-                print(f"Error sending response: {e}")
-        
-        # Clean up
-        if identifier in rcon_listener.pending_responses:
-            del rcon_listener.pending_responses[identifier]
+    response = f"🗺️ **Zone Command Response**:\n```\n{message}\n```"
+    if not confirmation:
+        await post_reply(discord_channel, response)
+    elif len(confirmation) + 1 + len(response) <= DISCORD_MESSAGE_MAX:
+        # Confirmation and response in one Discord message
+        await post_reply(discord_channel, f"{confirmation}\n{response}")
+    else:
+        await post_reply(discord_channel, confirmation, response)
 
 # Discord bot setup
-intents = discord.Intents.default()
+# Only the events this bot uses: guild messages and their content
+intents = discord.Intents.none()
+intents.guilds = True
+intents.guild_messages = True
 intents.message_content = True
-bot = discord.Client(intents=intents)
+bot = discord.Client(intents=intents, chunk_guilds_at_startup=False,
+                     member_cache_flags=discord.MemberCacheFlags.none())
 
 # Global instances
 rcon_listener = None
@@ -173,174 +342,12 @@ async def on_ready():
     rcon_listener = RCONListener(SERVER_IP, RCON_PORT, RCON_PASSWORD)
     
     if await rcon_listener.connect():
+        # partial binds bot and listener once, the callback runs for every frame
         bot.loop.create_task(rcon_listener.listen_continuously(
-            lambda msg, ident: process_rcon_message(bot, rcon_listener, msg, ident)
+            partial(process_rcon_message, bot, rcon_listener)
         ))
 
-@bot.event
-async def on_message(message):
-    if message.author == bot.user:
-        return
-    
-    if message.channel.id != ZONES_CHANNEL_ID:
-        return
-    
-    print(f"Received command in ZONES channel: {message.content}")
-    
-    if message.content.startswith('!'):
-        content = message.content[1:].strip()
-        print(f"Processing command in zones channel: {content}")
-        
-        # CREATE CUSTOM ZONE
-        if content.startswith('createcustomzone'):
-            try:
-                parts = content.split(maxsplit=1)
-                if len(parts) < 2:
-                    await message.channel.send("""
-❌ **Incorrect format for createcustomzone**
-**Usage:** `!createcustomzone "Test" x,y,z rotation shape size pvp npcdamage radiation buildingdamage building`
-""")
-                    return
-                
-                rcon_command = f'zones.createcustomzone {parts[1]}'
-                success = await rcon_listener.send_command(rcon_command, "zone_create", message.channel)
-                
-                if success:
-                    await message.channel.send(f"🏗️ **Creating Custom Zone**\n`{rcon_command}`")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # EDIT CUSTOM ZONE
-        elif content.startswith('editcustomzone'):
-            try:
-                parts = content.split(maxsplit=3)
-                if len(parts) < 4:
-                    await message.channel.send("❌ Usage: `!editcustomzone \"ZoneName\" \"Setting\" \"Value\"`\nExample: `!editcustomzone \"Test\" showarea 1`")
-                    return
-                
-                zone_name = parts[1]
-                setting = parts[2]
-                value = parts[3]
-                
-                rcon_command = f'zones.editcustomzone {zone_name} {setting} {value}'
-                success = await rcon_listener.send_command(rcon_command, "zone_edit", message.channel)
-                
-                if success:
-                    await message.channel.send(f"⚙️ **Editing Zone '{zone_name}'**\n`{rcon_command}`")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # CUSTOM ZONE INFO
-        elif content.startswith('customzoneinfo'):
-            try:
-                parts = content.split(maxsplit=1)
-                if len(parts) < 2:
-                    await message.channel.send("❌ Usage: `!customzoneinfo \"ZoneName\"`")
-                    return
-                
-                zone_name = parts[1].strip('"')
-                rcon_command = f'zones.customzoneinfo "{zone_name}"'
-                success = await rcon_listener.send_command(rcon_command, "zone_info", message.channel)
-                
-                if success:
-                    await message.channel.send(f"📊 **Getting info for zone: {zone_name}**")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # LIST CUSTOM ZONES
-        elif content == 'listcustomzones':
-            rcon_command = 'zones.listcustomzones'
-            success = await rcon_listener.send_command(rcon_command, "zone_list", message.channel)
-            
-            if success:
-                await message.channel.send("📋 **Listing all custom zones...**")
-        
-        # DELETE CUSTOM ZONE
-        elif content.startswith('deletecustomzone'):
-            try:
-                parts = content.split(maxsplit=1)
-                if len(parts) < 2:
-                    await message.channel.send("❌ Usage: `!deletecustomzone \"ZoneName\"`")
-                    return
-                
-                zone_name = parts[1].strip('"')
-                rcon_command = f'zones.deletecustomzone "{zone_name}"'
-                success = await rcon_listener.send_command(rcon_command, "zone_delete", message.channel)
-                
-                if success:
-                    await message.channel.send(f"🗑️ **Deleting zone: {zone_name}**")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # LIST MONUMENT KILLZONES
-        elif content == 'listmonumentkillzones':
-            rcon_command = 'zones.listmonumentkillzones'
-            success = await rcon_listener.send_command(rcon_command, "monument_list", message.channel)
-            
-            if success:
-                await message.channel.send("🏛️ **Listing all monument killzones...**")
-        
-        # CLEAR MONUMENT KILLZONES
-        elif content == 'clearmonumentkillzones':
-            rcon_command = 'zones.clearmonumentkillzones'
-            success = await rcon_listener.send_command(rcon_command, "monument_clear", message.channel)
-            
-            if success:
-                await message.channel.send("🧹 **Clearing all monument killzones...**")
-        
-        # SET MONUMENT KILLZONE
-        elif content.startswith('setmonumentkillzone'):
-            try:
-                parts = content.split(maxsplit=2)
-                if len(parts) < 3:
-                    await message.channel.send("❌ Usage: `!setmonumentkillzone \"monumentname\" 0/1`\nExample: `!setmonumentkillzone gas_station_1 1`")
-                    return
-                
-                monument_name = parts[1]
-                state = parts[2]
-                
-                if state not in ['0', '1']:
-                    await message.channel.send("❌ State must be 0 (deactivate) or 1 (activate)")
-                    return
-                
-                rcon_command = f'zones.setmonumentkillzone {monument_name} {state}'
-                success = await rcon_listener.send_command(rcon_command, "monument_set", message.channel)
-                
-                if success:
-                    action = "Activating" if state == '1' else "Deactivating"
-                    await message.channel.send(f"🏛️ **{action} monument killzone: {monument_name}**")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # EDIT MONUMENT ZONE
-        elif content.startswith('editmonumentzone'):
-            try:
-                parts = content.split(maxsplit=3)
-                if len(parts) < 4:
-                    await message.channel.send("❌ Usage: `!editmonumentzone \"MonumentName\" \"Setting\" \"Value\"`\nExample: `!editmonumentzone \"gas_station_1\" \"radiation\" \"25\"`")
-                    return
-                
-                monument_name = parts[1]
-                setting = parts[2]
-                value = parts[3]
-                
-                rcon_command = f'zones.editcustomzone {monument_name} {setting} {value}'
-                success = await rcon_listener.send_command(rcon_command, "monument_edit", message.channel)
-                
-                if success:
-                    await message.channel.send(f"🏛️ **Editing monument zone: {monument_name}**\n`{rcon_command}`")
-                
-            except Exception as e:
-                await message.channel.send(f"❌ Error: {str(e)}")
-        
-        # HELP COMMAND
-        elif content == 'help':
-            help_text = """
+_HELP_TEXT = """
 **🏗️ ZONE COMMANDS:**
   `!createcustomzone "Test" x,y,z rotation shape size pvp npcdamage radiation buildingdamage building`
   `!createcustomzone "Test" 10,10,10 45 box 150,150,150 1 1 0 1 1`
@@ -372,10 +379,143 @@ async def on_message(message):
 • `!setmonumentkillzone "monumentname" 0/1`
 • `!editmonumentzone "gas_station_1" radiation 25`
 """
-            await message.channel.send(help_text)
+
+async def send_zone_command(message, rcon_command: str, command_type: str, confirmation: str):
+    """Send rcon_command, its reply is posted to the message's channel together with confirmation"""
+    if not await rcon_listener.send_command(rcon_command, command_type, message.channel, confirmation):
+        await message.channel.send("❌ Failed to send command")
+
+async def handle_createcustomzone(message, args: str):
+    """!createcustomzone "Name" x,y,z rotation shape size ... - create a custom zone"""
+    if not args:
+        await message.channel.send("""
+❌ **Incorrect format for createcustomzone**
+**Usage:** `!createcustomzone "Test" x,y,z rotation shape size pvp npcdamage radiation buildingdamage building`
+""")
+        return
+    
+    rcon_command = f'zones.createcustomzone {args}'
+    await send_zone_command(message, rcon_command, "zone_create", f"🏗️ **Creating Custom Zone**\n`{rcon_command}`")
+
+async def handle_editcustomzone(message, args: str):
+    """!editcustomzone "Name" setting value - change a custom zone setting"""
+    parts = args.split(maxsplit=2)
+    if len(parts) < 3:
+        await message.channel.send("❌ Usage: `!editcustomzone \"ZoneName\" \"Setting\" \"Value\"`\nExample: `!editcustomzone \"Test\" showarea 1`")
+        return
+    
+    zone_name, setting, value = parts
+    
+    rcon_command = f'zones.editcustomzone {zone_name} {setting} {value}'
+    await send_zone_command(message, rcon_command, "zone_edit", f"⚙️ **Editing Zone '{zone_name}'**\n`{rcon_command}`")
+
+async def handle_customzoneinfo(message, args: str):
+    """!customzoneinfo "Name" - show a custom zone's settings"""
+    if not args:
+        await message.channel.send("❌ Usage: `!customzoneinfo \"ZoneName\"`")
+        return
+    
+    zone_name = args.strip('"')
+    rcon_command = f'zones.customzoneinfo "{zone_name}"'
+    await send_zone_command(message, rcon_command, "zone_info", f"📊 **Getting info for zone: {zone_name}**")
+
+async def handle_listcustomzones(message, args: str):
+    """!listcustomzones - list all custom zones"""
+    await send_zone_command(message, 'zones.listcustomzones', "zone_list", "📋 **Listing all custom zones...**")
+
+async def handle_deletecustomzone(message, args: str):
+    """!deletecustomzone "Name" - delete a custom zone"""
+    if not args:
+        await message.channel.send("❌ Usage: `!deletecustomzone \"ZoneName\"`")
+        return
+    
+    zone_name = args.strip('"')
+    rcon_command = f'zones.deletecustomzone "{zone_name}"'
+    await send_zone_command(message, rcon_command, "zone_delete", f"🗑️ **Deleting zone: {zone_name}**")
+
+async def handle_listmonumentkillzones(message, args: str):
+    """!listmonumentkillzones - list all monument killzones"""
+    await send_zone_command(message, 'zones.listmonumentkillzones', "monument_list", "🏛️ **Listing all monument killzones...**")
+
+async def handle_clearmonumentkillzones(message, args: str):
+    """!clearmonumentkillzones - clear all monument killzones"""
+    await send_zone_command(message, 'zones.clearmonumentkillzones', "monument_clear", "🧹 **Clearing all monument killzones...**")
+
+async def handle_setmonumentkillzone(message, args: str):
+    """!setmonumentkillzone monument 0/1 - turn a monument killzone off or on"""
+    parts = args.split(maxsplit=1)
+    if len(parts) < 2:
+        await message.channel.send("❌ Usage: `!setmonumentkillzone \"monumentname\" 0/1`\nExample: `!setmonumentkillzone gas_station_1 1`")
+        return
+    
+    monument_name, state = parts
+    
+    if state not in ['0', '1']:
+        await message.channel.send("❌ State must be 0 (deactivate) or 1 (activate)")
+        return
+    
+    rcon_command = f'zones.setmonumentkillzone {monument_name} {state}'
+    action = "Activating" if state == '1' else "Deactivating"
+    await send_zone_command(message, rcon_command, "monument_set", f"🏛️ **{action} monument killzone: {monument_name}**")
+
+async def handle_editmonumentzone(message, args: str):
+    """!editmonumentzone monument setting value - change a monument zone setting"""
+    parts = args.split(maxsplit=2)
+    if len(parts) < 3:
+        await message.channel.send("❌ Usage: `!editmonumentzone \"MonumentName\" \"Setting\" \"Value\"`\nExample: `!editmonumentzone \"gas_station_1\" \"radiation\" \"25\"`")
+        return
+    
+    monument_name, setting, value = parts
+    
+    rcon_command = f'zones.editcustomzone {monument_name} {setting} {value}'
+    await send_zone_command(message, rcon_command, "monument_edit", f"🏛️ **Editing monument zone: {monument_name}**\n`{rcon_command}`")
+
+async def handle_help(message, args: str):
+    """!help - show available commands"""
+    await message.channel.send(_HELP_TEXT)
+
+# Command name -> handler, looked up once per message instead of a startswith chain
+COMMANDS = {
+    'createcustomzone': handle_createcustomzone,
+    'editcustomzone': handle_editcustomzone,
+    'customzoneinfo': handle_customzoneinfo,
+    'listcustomzones': handle_listcustomzones,
+    'deletecustomzone': handle_deletecustomzone,
+    'listmonumentkillzones': handle_listmonumentkillzones,
+    'clearmonumentkillzones': handle_clearmonumentkillzones,
+    'setmonumentkillzone': handle_setmonumentkillzone,
+    'editmonumentzone': handle_editmonumentzone,
+    'help': handle_help,
+}
+
+@bot.event
+async def on_message(message):
+    if message.author == bot.user:
+        return
+    
+    if message.channel.id != ZONES_CHANNEL_ID:
+        return
+    
+    print(f"Received command in ZONES channel: {message.content}")
+    
+    if message.content.startswith('!'):
+        content = message.content[1:].strip()
+        print(f"Processing command in zones channel: {content}")
+        # The command name ends at any whitespace (space, tab, newline)
+        parts = content.split(maxsplit=1)
+        cmd = parts[0] if parts else ''
+        args = parts[1] if len(parts) > 1 else ''
         
+        handler = COMMANDS.get(cmd)
+        if handler:
+            try:
+                await handler(message, args.strip())
+            except Exception as e:
+                await message.channel.send(f"❌ Error: {str(e)}")
         else:
             await message.channel.send(f"❌ Unknown command: `{content}`. Type `!help` for available commands.")
 
 # Run the bot
-bot.run(TOKEN)
+if uvloop:
+    uvloop.install()
+bot.run(TOKEN, log_handler=None)  # logging is already configured above